@@ -1,53 +1,162 @@
 """Activities API Routes"""
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from uuid import uuid4
+import base64
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
+from sqlalchemy import JSON, cast, select, func, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from functools import lru_cache
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.activity_buffer import activity_buffer
+from app.core.serializer_utils import ORJSONResponse
 from app.models.models import Activity
 from app.schemas import ActivityCreate, ActivityResponse
 
-router = APIRouter(prefix="/api/activities", tags=["Activities"])
+router = APIRouter(prefix="/api/activities", tags=["Activities"], default_response_class=ORJSONResponse)
+
+INVALID_CURSOR = dict(status_code=400, detail="Invalid cursor")
+
+# Column-only select: rows come back as mappings, no ORM objects are hydrated
+LIST_ACTIVITIES = select(
+    Activity.id,
+    Activity.user_id,
+    Activity.action,
+    Activity.entity_type,
+    Activity.entity_id,
+    Activity.details,
+    Activity.created_at,
+)
+
+# Newest first; id breaks ties between rows with the same timestamp
+NEWEST_FIRST = (Activity.created_at.desc(), Activity.id.desc())
+
+@lru_cache(maxsize=None)
+def _list_activities_json(dialect: str):
+    """Select that builds the whole list as one JSON text value in the database"""
+    if dialect == "postgresql":
+        # Ordered inside the aggregate: json_agg(... ORDER BY ...)
+        agg, build = func.json_agg, func.json_build_object
+        cols = Activity.__table__.c
+    elif dialect == "sqlite":
+        # json_group_array takes rows in the order the subquery yields them
+        agg, build = func.json_group_array, func.json_object
+        cols = LIST_ACTIVITIES.order_by(*NEWEST_FIRST).subquery().c
+    else:
+        # MySQL's JSON_ARRAYAGG has no ORDER BY and the optimizer may drop
+        # a derived table's ORDER BY, so MySQL uses the row query
+        return None
+
+    created_at = cols.created_at
+    # details is stored as JSON text; embedded as JSON, not as a string
+    if dialect == "sqlite":
+        # SQLite stores "YYYY-MM-DD HH:MM:SS"; match isoformat()
+        created_at = func.replace(created_at, " ", "T")
+        details = func.json(cols.details)
+    else:
+        details = cast(cols.details, JSON)
+
+    row = build(
+        "id", cols.id,
+        "user_id", cols.user_id,
+        "action", cols.action,
+        "entity_type", cols.entity_type,
+        "entity_id", cols.entity_id,
+        "details", details,
+        "created_at", created_at,
+    )
+    if dialect == "postgresql":
+        row = aggregate_order_by(row, *NEWEST_FIRST)
+    return select(agg(row))
+
+def _encode_cursor(created_at: datetime, activity_id: str) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of a row"""
+    raw = f"{created_at.isoformat()}|{activity_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, activity_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), activity_id
+    except ValueError:
+        raise HTTPException(**INVALID_CURSOR)
 
 @router.get("/", response_model=list)
-async def list_activities(db: Session = Depends(get_db)):
-    """List all activities"""
-    activities = db.query(Activity).all()
-    return [
-        {
-            "id": a.id,
-            "user_id": a.user_id,
-            "action": a.action,
-            "entity_type": a.entity_type,
-            "entity_id": a.entity_id,
-            "details": a.details,
-            "created_at": a.created_at.isoformat() if a.created_at else ""
-        }
-        for a in activities
-    ]
+async def list_activities(
+    request: Request,
+    project_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List activities, newest first
+
+    Pass `limit` to page through results; the next page's cursor is returned
+    in the `X-Next-Cursor` header and goes back in as `after`.
+
+    Responses carry an `ETag`; polling with `If-None-Match` gets a 304 while
+    nothing has been added or removed.
+    """
+    # Cheap change check: newest timestamp + row count
+    version = select(func.max(Activity.created_at), func.count())
+    if project_id is not None:
+        version = version.where(Activity.project_id == project_id)
+    newest, count = (await db.execute(version)).one()
+    etag = f'W/"{newest.timestamp() if newest else 0}-{count}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if limit is None and after is None and project_id is None:
+        stmt = _list_activities_json(db.bind.dialect.name)
+        if stmt is not None:
+            # Aggregates return NULL (Postgres/MySQL) when there are no rows
+            payload = await db.scalar(stmt)
+            return Response(content=payload or "[]", media_type="application/json", headers={"ETag": etag})
+
+    stmt = LIST_ACTIVITIES.order_by(*NEWEST_FIRST)
+    if project_id is not None:
+        stmt = stmt.where(Activity.project_id == project_id)
+    if after is not None:
+        # Keyset seek: O(log N) on the (project_id, created_at) index, unlike OFFSET
+        stmt = stmt.where(tuple_(Activity.created_at, Activity.id) < _decode_cursor(after))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    rows = (await db.execute(stmt)).mappings().all()
+    activities = []
+    for row in rows:
+        activity = dict(row)
+        # Decoded, so details comes back as the object that was posted
+        if activity["details"] is not None:
+            activity["details"] = json.loads(activity["details"])
+        activities.append(activity)
+    # Returned directly so orjson encodes created_at itself (no jsonable_encoder pass)
+    response = ORJSONResponse(activities, headers={"ETag": etag})
+    if limit is not None and len(rows) == limit:
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last["created_at"], last["id"])
+    return response
 
 @router.post("/", response_model=ActivityResponse)
-async def create_activity(activity: ActivityCreate, db: Session = Depends(get_db)):
-    """Create new activity"""
-    new_activity = Activity(
-        id=str(uuid4()),
+async def create_activity(activity: ActivityCreate):
+    """Create new activity (queued, written by the next batch flush)"""
+    new_activity = activity_buffer.add(
         user_id="user-001",
         action=activity.action,
         entity_type=activity.entity_type,
         entity_id=activity.entity_id,
-        details=activity.details,
-        created_at=datetime.now()
+        details=json.dumps(activity.details) if activity.details is not None else None,
     )
-    db.add(new_activity)
-    db.commit()
-    db.refresh(new_activity)
     
     return {
-        "id": new_activity.id,
-        "user_id": new_activity.user_id,
-        "action": new_activity.action,
-        "entity_type": new_activity.entity_type,
-        "entity_id": new_activity.entity_id,
-        "details": new_activity.details,
-        "created_at": new_activity.created_at.isoformat()
+        "id": new_activity["id"],
+        "user_id": new_activity["user_id"],
+        "action": new_activity["action"],
+        "entity_type": new_activity["entity_type"],
+        "entity_id": new_activity["entity_id"],
+        "details": activity.details,
+        "created_at": new_activity["created_at"]
     }
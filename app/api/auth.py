@@ -3,67 +3,91 @@ Authentication API Routes
 FIXED: Now creates real users in database and generates real JWT tokens
 """
 
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from uuid import uuid4
-import jwt
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.auth import (
+    encode_token, hash_password, verify_password, is_legacy_password, verify_legacy_password,
+    run_in_bcrypt_pool, cache_user,
+)
 from app.models.models import User
 from app.schemas import UserRegister, UserLogin, TokenResponse, UserResponse
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
-# JWT config
-SECRET_KEY = "your-secret-key-change-in-production"
-ALGORITHM = "HS256"
+# JWT config (key and algorithm live in app.core.auth)
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Everything login needs for the password check and token response;
+# selected instead of the full entity
+LOGIN_COLUMNS = (User.id, User.username, User.email, User.created_at, User.password_hash)
+
+USERNAME_TAKEN = dict(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Username already registered"
+)
+EMAIL_TAKEN = dict(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Email already registered"
+)
+INVALID_CREDENTIALS = dict(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid username or password"
+)
 
 def create_access_token(user_id: str):
     """Create JWT token"""
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    # NumericDate (epoch seconds), so no datetime arithmetic or conversion
     payload = {
         "user_id": user_id,
-        "exp": expire
+        "exp": int(time.time()) + ACCESS_TOKEN_EXPIRE_SECONDS
     }
-    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    token = encode_token(payload)
     return token
 
+def _cache_issued_token(token: str, user) -> None:
+    """Seed the verified-token cache so the first authenticated request is a hit"""
+    if not isinstance(user, User):
+        # Column-only row from a LOGIN_COLUMNS select
+        user = User(**user._mapping)
+    cache_user(token, user)
+
 @router.post("/register", response_model=TokenResponse)
-async def register(user: UserRegister, db: Session = Depends(get_db)):
+async def register(user: UserRegister, db: AsyncSession = Depends(get_async_db)):
     """Register a new user - creates in database"""
     
     try:
-        # Check if user already exists by username
-        existing_user = db.query(User).filter(User.username == user.username).first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already registered"
-            )
-        
-        # Check if email already exists
-        existing_email = db.query(User).filter(User.email == user.email).first()
-        if existing_email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
+        # Check username and email in one roundtrip
+        taken = User.username == user.username
+        if user.email is not None:
+            taken = or_(taken, User.email == user.email)
+        existing = (await db.execute(select(User.username, User.email).where(taken))).first()
+        if existing:
+            raise HTTPException(**(USERNAME_TAKEN if existing.username == user.username else EMAIL_TAKEN))
         
         # Create new user
         new_user = User(
             id=str(uuid4()),
             username=user.username,
             email=user.email,
-            password_hash=user.password,
+            password_hash=await run_in_bcrypt_pool(hash_password, user.password),
             created_at=datetime.now()
         )
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
         
         # Generate token
         token = create_access_token(new_user.id)
+        _cache_issued_token(token, new_user)
         
         return {
             "access_token": token,
@@ -78,32 +102,37 @@ async def register(user: UserRegister, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Registration error: {e}")
-        db.rollback()
+        logger.error("Registration error: %s", e)
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Registration failed: {str(e)}"
         )
 
 @router.post("/login", response_model=TokenResponse)
-async def login(user: UserLogin, db: Session = Depends(get_db)):
-    """Login user - finds existing or creates if doesn't exist"""
+async def login(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """Login user - checks an existing user's password, or creates the user if it doesn't exist"""
+    
+    # Nothing hashes to an empty password, so no lookup or bcrypt call
+    if not user.password:
+        raise HTTPException(**INVALID_CREDENTIALS)
     
     try:
         # Try to find user by username first
-        db_user = db.query(User).filter(User.username == user.username).first()
+        db_user = (await db.execute(select(*LOGIN_COLUMNS).where(User.username == user.username))).first()
         
         # If not found by username, try by email (in case they login with email)
         if not db_user and "@" in user.username:
-            db_user = db.query(User).filter(User.email == user.username).first()
+            db_user = (await db.execute(select(*LOGIN_COLUMNS).where(User.email == user.username))).first()
         
         # If user doesn't exist, create them (for demo purposes)
+        created = False
         if not db_user:
             # Use username as email if it looks like an email, otherwise create one
             email = user.username if "@" in user.username else f"{user.username}@example.com"
             
             # Check if email already exists (even if username doesn't match)
-            existing_email = db.query(User).filter(User.email == email).first()
+            existing_email = (await db.execute(select(*LOGIN_COLUMNS).where(User.email == email))).first()
             if existing_email:
                 # Email already exists, just use that user
                 db_user = existing_email
@@ -112,16 +141,31 @@ async def login(user: UserLogin, db: Session = Depends(get_db)):
                 db_user = User(
                     id=str(uuid4()),
                     username=user.username,
-                    password_hash=user.password,
+                    password_hash=await run_in_bcrypt_pool(hash_password, user.password),
                     email=email,
                     created_at=datetime.now()
                 )
                 db.add(db_user)
-                db.commit()
-                db.refresh(db_user)
+                await db.commit()
+                created = True
+        
+        # Existing accounts must present their password
+        if not created:
+            stored = db_user.password_hash or ""
+            if is_legacy_password(stored):
+                # Stored in plaintext before passwords were hashed; upgraded
+                # to bcrypt on the first successful login
+                if not verify_legacy_password(user.password, stored):
+                    raise HTTPException(**INVALID_CREDENTIALS)
+                password_hash = await run_in_bcrypt_pool(hash_password, user.password)
+                await db.execute(update(User).where(User.id == db_user.id).values(password_hash=password_hash))
+                await db.commit()
+            elif not await run_in_bcrypt_pool(verify_password, user.password, stored):
+                raise HTTPException(**INVALID_CREDENTIALS)
         
         # Generate token
         token = create_access_token(db_user.id)
+        _cache_issued_token(token, db_user)
         
         return {
             "access_token": token,
@@ -133,9 +177,11 @@ async def login(user: UserLogin, db: Session = Depends(get_db)):
                 "created_at": db_user.created_at.isoformat()
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Login error: {e}")
-        db.rollback()
+        logger.error("Login error: %s", e)
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Login failed: {str(e)}"
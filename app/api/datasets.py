@@ -1,90 +1,538 @@
 """Datasets API Routes"""
-from fastapi import APIRouter, Depends, Path, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Query, Request, UploadFile, File, Form, status
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from uuid import uuid4
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import os
+import hashlib
+import shutil
+import logging
 import pandas as pd
 import numpy as np
 import io
-from app.core.database import get_db
+import orjson
+from app.core.database import get_db, SessionLocal
 from app.models.models import Dataset
 from app.schemas import DatasetCreate, DatasetResponse
+from app.core.frame_cache import DataFrameLRU
+from app.core.universal_eda_analyzer import count_duplicate_rows
+from app.core.serializer_utils import SafeJSONResponse, safe_json_dumps
 
+# pyarrow (when installed) gives a multi-threaded CSV reader and Parquet snapshots
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+CSV_ENGINE = "pyarrow" if HAS_PYARROW else "c"
+# Full-file reads: pyarrow does its own file I/O; the C parser memory-maps the
+# file rather than copying it through Python-side read buffers
+CSV_READ_OPTIONS = {"engine": CSV_ENGINE} if HAS_PYARROW else {"engine": CSV_ENGINE, "memory_map": True}
+
+# polars (when installed) computes quality metrics with one lazy scan of the
+# file on disk, without building a pandas frame
+try:
+    import polars as pl
+    HAS_POLARS = True
+except ImportError:
+    HAS_POLARS = False
+
+logger = logging.getLogger(__name__)
+
+# Endpoints that read files or run pandas are plain def, so they run in
+# the threadpool
 router = APIRouter(prefix="/api/datasets", tags=["Datasets"])
 
 # Directory to store uploaded files
 UPLOAD_DIR = "data/uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Upload bytes are stored once per SHA-256 here; each dataset's CSV is a
+# hard link to its blob, so re-uploading the same file costs no extra disk
+OBJECT_DIR = f"{UPLOAD_DIR}/objects"
+os.makedirs(OBJECT_DIR, exist_ok=True)
+
+# Uploads are copied to disk in chunks of this size rather than read whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_SIZE_BYTES = int(os.getenv("MAX_UPLOAD_SIZE_BYTES", str(1024 ** 3)))
+
+# Room for the multipart boundaries and form fields around the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+ALLOWED_EXTENSIONS = frozenset({".csv"})
+
+UNSUPPORTED_FILE_TYPE = dict(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail=f"Unsupported file type; allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
+)
+UPLOAD_TOO_LARGE = dict(
+    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    detail=f"File exceeds the {MAX_UPLOAD_SIZE_BYTES} byte upload limit"
+)
+
+# Error bodies returned (with 200) by the preview and quality endpoints
+DATASET_NOT_FOUND_ERROR = {"error": "Dataset not found"}
+NO_DATA_ERROR = {"error": "No data available"}
+QUALITY_FAILED = dict(
+    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+    detail="Quality analysis failed"
+)
+
+# A dataset file that is missing, empty or can't be parsed; reported as no
+# data. Any other error is a bug and is logged with its traceback
+DATASET_READ_ERRORS = (OSError, UnicodeDecodeError, pd.errors.ParserError, pd.errors.EmptyDataError)
+if HAS_PYARROW:
+    DATASET_READ_ERRORS += (pa.ArrowInvalid,)
+if HAS_POLARS:
+    DATASET_READ_ERRORS += (pl.exceptions.ComputeError,)
+
+# Previews are sent as an Arrow IPC stream to clients that ask for it
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+# ... or as newline-delimited JSON, streamed this many rows at a time
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+PREVIEW_STREAM_CHUNK_ROWS = 1000
+
+# Parsed datasets kept in memory per worker, least recently used evicted
+# first once their combined size passes the budget
+DATASET_CACHE_BYTES = int(os.getenv("DATASET_CACHE_BYTES", str(512 * 1024 ** 2)))
+dataset_cache = DataFrameLRU(DATASET_CACHE_BYTES)
+
+# Largest preview a client can ask for (the `rows` query parameter)
+MAX_PREVIEW_ROWS = int(os.getenv("MAX_PREVIEW_ROWS", "10000"))
+
+# Frames wider than this get their per-column distinct counts computed in
+# parallel; pandas' hashing kernels release the GIL for most dtypes
+PARALLEL_COLUMN_THRESHOLD = 64
+
+# Parsed text columns with fewer distinct values than this share of rows are
+# cached as category (one copy of each string plus small integer codes)
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+def _dtype_name(dtype) -> str:
+    """
+    Reported name of a column's dtype. Categoricals report their values'
+    dtype: category is a cache-side encoding, so a column reads the same
+    whether it came from the raw CSV or a compacted frame
+    """
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+    return str(dtype)
+
+def _unique_counts(df: pd.DataFrame) -> List[int]:
+    """nunique() for every column, in column order"""
+    if df.shape[1] <= PARALLEL_COLUMN_THRESHOLD:
+        return df.nunique().tolist()
+    columns = [df.iloc[:, i] for i in range(df.shape[1])]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        return list(pool.map(pd.Series.nunique, columns))
+
+# Above this many cells the Polars scan estimates distinct and duplicate
+# counts with HyperLogLog (constant memory) instead of exact hash sets
+APPROX_DISTINCT_CELL_THRESHOLD = int(os.getenv("APPROX_DISTINCT_CELL_THRESHOLD", "50000000"))
+
+def _frame_quality_stats(df: pd.DataFrame) -> dict:
+    """Inputs for the quality report, from an in-memory frame"""
+    return {
+        "total_rows": len(df),
+        "columns": [(col, _dtype_name(dtype)) for col, dtype in df.dtypes.items()],
+        # One reduction over the frame for every column
+        "null_counts": df.isnull().sum().tolist(),
+        "unique_counts": _unique_counts(df),
+        "duplicate_rows": count_duplicate_rows(df),
+        "approximate": False,
+    }
+
+def _scan_quality_stats(dataset_id: str) -> Optional[dict]:
+    """
+    Inputs for the quality report from a single lazy Polars query over the
+    Parquet snapshot, or None if there is no snapshot yet
+    
+    Row, null, distinct and duplicate counts come back from one
+    multi-threaded pass; the file is never loaded into pandas. Past
+    APPROX_DISTINCT_CELL_THRESHOLD cells the distinct and duplicate counts
+    are HyperLogLog estimates.
+    
+    The raw CSV is never scanned: Polars parses it with different null
+    markers and types than read_csv, so its counts wouldn't match the
+    pandas path's.
+    """
+    snapshot_path = _snapshot_path(dataset_id)
+    if not (HAS_PYARROW and os.path.exists(snapshot_path)):
+        return None
+    lf = pl.scan_parquet(snapshot_path)
+    
+    schema = lf.collect_schema()
+    names = schema.names()
+    n = len(names)
+    
+    # Footer-only
+    total_rows = lf.select(pl.len()).collect().item()
+    approximate = total_rows * n > APPROX_DISTINCT_CELL_THRESHOLD
+    
+    def distinct(expr):
+        return expr.approx_n_unique() if approximate else expr.n_unique()
+    
+    # Rows are compared whole; the estimator takes a 64-bit hash of each row
+    row_key = pl.struct(names).hash() if approximate else pl.struct(names)
+    
+    # Positional aliases, so column names can't collide with each other
+    row = lf.select(
+        pl.len().alias("rows"),
+        (pl.len() - distinct(row_key)).alias("duplicates"),
+        *[pl.col(c).null_count().alias(f"n{i}") for i, c in enumerate(names)],
+        # drop_nulls() to match pandas nunique(), which doesn't count NaN
+        *[distinct(pl.col(c).drop_nulls()).alias(f"u{i}") for i, c in enumerate(names)],
+    ).collect().row(0)
+    
+    # Reported under the pandas dtypes the snapshot was written with
+    pandas_types = _snapshot_dtype_names(pq.read_schema(snapshot_path))
+    return {
+        "total_rows": row[0],
+        "columns": [(c, pandas_types.get(c, str(dtype).lower())) for c, dtype in schema.items()],
+        "null_counts": list(row[2:2 + n]),
+        "unique_counts": list(row[2 + n:]),
+        # An estimate can overshoot the row count
+        "duplicate_rows": max(row[1], 0),
+        "approximate": approximate,
+    }
+
+def _snapshot_dtype_names(schema) -> dict:
+    """
+    Column name -> dtype name (see _dtype_name) of the frame the snapshot
+    reads back as, from its schema alone
+    """
+    # Zero rows, but the dtypes pandas metadata restores
+    empty = schema.empty_table().to_pandas()
+    names = {}
+    for col, dtype in empty.dtypes.items():
+        field_type = schema.field(col).type
+        if pa.types.is_dictionary(field_type):
+            # A category: its empty categories lose their dtype, so it's
+            # taken from the dictionary's value type instead
+            dtype = pa.array([], type=field_type.value_type).to_pandas().dtype
+        names[col] = _dtype_name(dtype)
+    return names
+
+def _footer_quality_stats(dataset_id: str) -> Optional[dict]:
+    """
+    Row and null counts from the Parquet snapshot's footer alone, or None
+    if there is no snapshot or a column chunk lacks null-count statistics
+    
+    No column data is read, so distinct and duplicate counts are None.
+    """
+    snapshot_path = _snapshot_path(dataset_id)
+    if not os.path.exists(snapshot_path):
+        return None
+    
+    parquet = pq.ParquetFile(snapshot_path)
+    metadata = parquet.metadata
+    null_counts = [0] * metadata.num_columns
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(metadata.num_columns):
+            statistics = row_group.column(j).statistics
+            if statistics is None or not statistics.has_null_count:
+                return None
+            null_counts[j] += statistics.null_count
+    
+    schema = parquet.schema_arrow
+    pandas_types = _snapshot_dtype_names(schema)
+    return {
+        "total_rows": metadata.num_rows,
+        "columns": [(name, pandas_types.get(name, str(schema.field(name).type))) for name in schema.names],
+        "null_counts": null_counts,
+        "unique_counts": [None] * metadata.num_columns,
+        "duplicate_rows": None,
+        "approximate": False,
+    }
+
+def _csv_path(dataset_id: str) -> str:
+    return f"{UPLOAD_DIR}/{dataset_id}.csv"
+
+def _snapshot_path(dataset_id: str) -> str:
+    """Columnar copy of the parsed CSV, written once after upload"""
+    return f"{UPLOAD_DIR}/{dataset_id}.parquet"
+
+def _compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a freshly parsed CSV before it's cached: repetitive text columns
+    become category
+    
+    Numeric columns keep their parsed int64/float64 dtypes; narrower ones
+    overflow in the numpy arithmetic the EDA modules run on them.
+    """
+    threshold = len(df) * CATEGORY_MAX_UNIQUE_RATIO
+    # "string" picks up pandas 3's default str dtype as well as object
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        if df[col].nunique() < threshold:
+            df[col] = df[col].astype("category")
+    return df
+
+def _analyze_dataset(dataset_id: str, file_path: str):
+    """Parse an uploaded CSV into the cache (runs after the response is sent)"""
+    try:
+        df = _compact_frame(pd.read_csv(file_path, **CSV_READ_OPTIONS))
+    except Exception as e:
+        logger.warning("Could not analyze CSV %s: %s", file_path, e)
+        return
+    dataset_cache.put(dataset_id, df)
+    
+    # Later loads (other workers, after restarts or cache eviction) read the
+    # snapshot instead of parsing the CSV again. Parquet keeps the compact
+    # dtypes, category as dictionary-encoded columns
+    if HAS_PYARROW:
+        snapshot_path = _snapshot_path(dataset_id)
+        try:
+            df.to_parquet(f"{snapshot_path}.part", compression="zstd")
+            os.replace(f"{snapshot_path}.part", snapshot_path)
+        except Exception as e:
+            logger.warning("Could not write Parquet snapshot %s: %s", snapshot_path, e)
+
+def _preview_parquet(path: str, rows: int):
+    # Only the first batch is decoded; the row count comes from the footer
+    parquet = pq.ParquetFile(path)
+    batch = next(parquet.iter_batches(batch_size=rows), None)
+    df = batch.to_pandas() if batch is not None else None
+    return df, parquet.metadata.num_rows
+
+def _preview_csv(path: str, rows: int):
+    if HAS_PYARROW:
+        # Streaming reader: blocks are parsed (multi-threaded) only until
+        # enough rows are in. Column types are inferred from the first block,
+        # so a later block that doesn't fit them (ints, then text) raises and
+        # the preview falls back to pandas below.
+        batches = []
+        read = 0
+        # Empty strings as nulls, matching read_csv's defaults
+        convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+        try:
+            with pacsv.open_csv(path, convert_options=convert_options) as reader:
+                for batch in reader:
+                    batches.append(batch)
+                    read += batch.num_rows
+                    if read >= rows:
+                        break
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+            return table.slice(0, rows).to_pandas(), None
+        except pa.ArrowInvalid as e:
+            logger.info("Streaming CSV preview of %s failed, falling back to pandas: %s", path, e)
+    # Memory-mapped, so only the pages holding those rows are read in
+    return pd.read_csv(path, nrows=rows, memory_map=True), None
 
-# In-memory storage for dataset content
-dataset_cache = {}
+# Preview reader per stored file extension
+PREVIEW_READERS = {
+    ".parquet": _preview_parquet,
+    ".csv": _preview_csv,
+}
+
+def _read_preview(path: str, mtime_ns: int, rows: int):
+    """
+    First `rows` rows of a snapshot or CSV, and the file's total row count
+    (None when only the preview rows were read)
+    
+    Cached in dataset_cache, so previews count against the same memory
+    budget as full frames. Files are written once, so (path, mtime)
+    identifies the content: the snapshot replacing the CSV, or a re-upload,
+    is a new key.
+    """
+    key = f"preview:{path}:{mtime_ns}:{rows}"
+    cached = dataset_cache.get_with_info(key)
+    if cached is not None:
+        return cached
+    df, total_rows = PREVIEW_READERS[os.path.splitext(path)[1]](path, rows)
+    if df is not None:
+        dataset_cache.put(key, df, info=total_rows)
+    return df, total_rows
+
+def _column_values(values: pd.Series):
+    """
+    One preview column as a JSON array: numeric columns are encoded straight
+    from their numpy buffer, the rest are left to the response's encoder
+    """
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biuf":
+        array = np.ascontiguousarray(values.to_numpy())
+        return orjson.Fragment(orjson.dumps(array, option=orjson.OPT_SERIALIZE_NUMPY))
+    return values.tolist()
+
+def _stream_preview_ndjson(preview: pd.DataFrame):
+    """Encode preview rows as NDJSON, one chunk of rows at a time"""
+    for start in range(0, len(preview), PREVIEW_STREAM_CHUNK_ROWS):
+        chunk = preview.iloc[start:start + PREVIEW_STREAM_CHUNK_ROWS]
+        # Same encoder as the JSON layouts, so values match them exactly
+        yield "".join(safe_json_dumps(record) + "\n" for record in chunk.to_dict(orient="records")).encode()
+
+def load_dataset_frame(dataset_id: str) -> Optional[pd.DataFrame]:
+    """
+    Full DataFrame for a dataset, or None if it has no file
+    
+    Checks the in-memory cache, then the Parquet snapshot, then parses the
+    uploaded CSV. Whatever is loaded is cached.
+    """
+    df = dataset_cache.get(dataset_id)
+    if df is not None:
+        return df
+    
+    snapshot_path = _snapshot_path(dataset_id)
+    file_path = _csv_path(dataset_id)
+    if HAS_PYARROW and os.path.exists(snapshot_path):
+        df = pd.read_parquet(snapshot_path)
+    elif os.path.exists(file_path):
+        df = _compact_frame(pd.read_csv(file_path, **CSV_READ_OPTIONS))
+    else:
+        return None
+    
+    dataset_cache.put(dataset_id, df)
+    return df
+
+def _copy_hashed(src, dst_path: str) -> Tuple[int, str]:
+    """
+    Copy src to dst_path and return its size and hex SHA-256, hashing each
+    chunk as it's written so the file is read once
+    
+    One buffer is reused for every chunk instead of a new bytes object per
+    read. Raises 413 as soon as MAX_UPLOAD_SIZE_BYTES is crossed, without
+    reading the rest.
+    """
+    buffer = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    hasher = hashlib.sha256()
+    size = 0
+    with open(dst_path, "wb") as f:
+        while n := src.readinto(buffer):
+            size += n
+            if size > MAX_UPLOAD_SIZE_BYTES:
+                raise HTTPException(**UPLOAD_TOO_LARGE)
+            f.write(view[:n])
+            hasher.update(view[:n])
+    return size, hasher.hexdigest()
+
+def _store_object(part_path: str, digest: str, file_path: str) -> None:
+    """Move part_path into the object store under digest and link file_path to it"""
+    object_path = f"{OBJECT_DIR}/{digest}.csv"
+    if os.path.exists(object_path):
+        # Same bytes already stored; the new copy is redundant
+        os.remove(part_path)
+    else:
+        os.replace(part_path, object_path)
+    try:
+        os.link(object_path, file_path)
+    except OSError:
+        # Filesystem without hard links: fall back to a private copy
+        shutil.copyfile(object_path, file_path)
+
+async def _save_upload(file: UploadFile, file_path: str) -> int:
+    """Copy an upload into the object store, link it at file_path and return its size"""
+    # Spooled under a temporary name, so a rejected or interrupted upload
+    # never leaves a partial dataset file behind
+    part_path = f"{file_path}.part"
+    try:
+        # Reads the spooled file's underlying BytesIO or temp file directly
+        src = getattr(file.file, "_file", file.file)
+        if getattr(file.file, "_rolled", False):
+            # Already on disk, so its size is known before anything is copied
+            if os.fstat(src.fileno()).st_size > MAX_UPLOAD_SIZE_BYTES:
+                raise HTTPException(**UPLOAD_TOO_LARGE)
+            file_size, digest = await run_in_threadpool(_copy_hashed, src, part_path)
+        else:
+            # Small enough to still be held in memory
+            file_size, digest = _copy_hashed(src, part_path)
+        # May fall back to copying the whole file, so off the event loop
+        await run_in_threadpool(_store_object, part_path, digest, file_path)
+    except BaseException:
+        # BaseException so a cancelled request (client gone) cleans up too
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return file_size
+
+# Columns returned by list_datasets; rows come back as tuples, not entities
+DATASET_LIST_COLUMNS = (
+    Dataset.id,
+    Dataset.name,
+    Dataset.project_id,
+    Dataset.description,
+    Dataset.file_name,
+    Dataset.file_size_bytes,
+    Dataset.created_at,
+)
+# Rows fetched per round trip (and sent per chunk) while streaming the list
+DATASET_LIST_BATCH_SIZE = 100
+
+def _stream_dataset_list():
+    """Encode the dataset list as a JSON array, one batch of rows at a time"""
+    # Own session: the body is produced after the endpoint has returned
+    with SessionLocal() as db:
+        result = db.execute(
+            select(*DATASET_LIST_COLUMNS).execution_options(yield_per=DATASET_LIST_BATCH_SIZE)
+        )
+        yield b"["
+        first = True
+        for batch in result.partitions():
+            chunk = b",".join(
+                orjson.dumps({
+                    "id": d.id,
+                    "name": d.name,
+                    "project_id": d.project_id,
+                    "description": d.description,
+                    "file_name": d.file_name,
+                    "file_size_bytes": d.file_size_bytes,
+                    "created_at": d.created_at.isoformat() if d.created_at else ""
+                })
+                for d in batch
+            )
+            yield chunk if first else b"," + chunk
+            first = False
+        yield b"]"
 
 @router.get("/", response_model=list)
-async def list_datasets(db: Session = Depends(get_db)):
-    """List all datasets"""
-    datasets = db.query(Dataset).all()
-    return [
-        {
-            "id": d.id,
-            "name": d.name,
-            "project_id": d.project_id,
-            "description": d.description,
-            "file_name": d.file_name,
-            "file_size_bytes": d.file_size_bytes,
-            "created_at": d.created_at.isoformat() if d.created_at else ""
-        }
-        for d in datasets
-    ]
+async def list_datasets():
+    """List all datasets (streamed, so memory stays flat however many there are)"""
+    return StreamingResponse(_stream_dataset_list(), media_type="application/json")
 
-@router.post("/")
+# 202: the row and file exist on return, but parsing/snapshotting is still queued
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
 async def create_dataset(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     name: str = Form(...),
     project_id: str = Form(...),
     description: Optional[str] = Form(None),
     db: Session = Depends(get_db)
 ):
-    """Create dataset - ANALYZES file and extracts statistics"""
+    """Create dataset - saves the file and analyzes it in the background"""
     
-    dataset_id = str(uuid4())
+    # Checked before any of the file is copied
+    if os.path.splitext(file.filename or "")[1].lower() not in ALLOWED_EXTENSIONS:
+        raise HTTPException(**UNSUPPORTED_FILE_TYPE)
     
-    # Save file first
-    file_path = f"{UPLOAD_DIR}/{dataset_id}.csv"
-    contents = await file.read()
+    dataset_id = str(uuid4())
     
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    file_path = _csv_path(dataset_id)
+    file_size = await _save_upload(file, file_path)
     
-    # ANALYZE the CSV file
-    try:
-        df = pd.read_csv(file_path)
-        row_count = len(df)
-        column_count = len(df.columns)
-        
-        # Cache it
-        dataset_cache[dataset_id] = df
-    except Exception as e:
-        row_count = 0
-        column_count = 0
-        print(f"Warning: Could not analyze CSV: {e}")
+    # Parse once the response is out; readers fall back to the file until then
+    background_tasks.add_task(_analyze_dataset, dataset_id, file_path)
     
-    # Create dataset record WITH statistics
+    # Create dataset record
     new_dataset = Dataset(
         id=dataset_id,
         name=name,
         project_id=project_id,
         description=description or "",
         file_name=file.filename,
-        file_size_bytes=len(contents),
+        file_size_bytes=file_size,
         created_at=datetime.now()
     )
     db.add(new_dataset)
-    db.commit()
-    db.refresh(new_dataset)
     
-    return {
+    # Every value is set above, so the response is built before commit()
+    # expires the instance; reading it afterwards would reload the row
+    response = {
         "id": new_dataset.id,
         "name": new_dataset.name,
         "project_id": new_dataset.project_id,
@@ -93,111 +541,191 @@ async def create_dataset(
         "file_size_bytes": new_dataset.file_size_bytes,
         "created_at": new_dataset.created_at.isoformat()
     }
+    await run_in_threadpool(db.commit)
+    
+    return response
 
 @router.get("/{dataset_id}/preview")
-async def get_dataset_preview(dataset_id: str = Path(...), rows: int = 100, db: Session = Depends(get_db)):
-    """Get dataset preview - returns actual data with columns and rows"""
-    dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+def get_dataset_preview(
+    request: Request,
+    dataset_id: str = Path(...),
+    rows: int = Query(100, ge=1, le=MAX_PREVIEW_ROWS),
+    layout: Literal["rows", "columns"] = "rows",
+    db: Session = Depends(get_db)
+):
+    """
+    Get dataset preview - returns actual data with columns and rows
+    
+    `layout=columns` returns `data` as one array per column instead of
+    `rows` as one object per row (smaller for wide tables).
+    Send `Accept: application/vnd.apache.arrow.stream` to get the rows as an
+    Arrow IPC stream instead, or `Accept: application/x-ndjson` to stream
+    them as one JSON object per line (total row count in `X-Total-Rows`).
+    """
+    # Existence check only
+    dataset = db.query(Dataset.id).filter(Dataset.id == dataset_id).first()
     if not dataset:
-        return {"error": "Dataset not found"}
+        return DATASET_NOT_FOUND_ERROR
     
-    df = None
+    total_rows = None
     
-    # Load from cache or file
-    if dataset_id in dataset_cache:
-        df = dataset_cache[dataset_id]
-    else:
-        file_path = f"{UPLOAD_DIR}/{dataset_id}.csv"
-        if os.path.exists(file_path):
-            try:
-                df = pd.read_csv(file_path, nrows=rows)
-                dataset_cache[dataset_id] = df
-            except Exception as e:
-                return {"error": f"Could not read file: {str(e)}"}
+    # Load from cache, snapshot or file
+    snapshot_path = _snapshot_path(dataset_id)
+    file_path = _csv_path(dataset_id)
+    df = dataset_cache.get(dataset_id)
+    if df is None:
+        # Only the preview rows are parsed, and repeat polls are served from
+        # their cached copy. Not cached as the dataset itself: quality and
+        # EDA need the whole file
+        path = snapshot_path if HAS_PYARROW and os.path.exists(snapshot_path) else file_path
+        try:
+            df, total_rows = _read_preview(path, os.stat(path).st_mtime_ns, rows)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            return {"error": f"Could not read file: {str(e)}"}
     
     if df is None or df.empty:
-        return {"error": "No data available"}
+        return NO_DATA_ERROR
+    
+    if total_rows is None:
+        total_rows = len(df)
+    
+    # Sliced once for every format below. iloc on a cached full frame is a
+    # view, and a frame from _read_preview already holds only these rows
+    preview = df.iloc[:rows]
+    
+    # Columnar and typed: no per-row dicts, column names sent once
+    if HAS_PYARROW and ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", ""):
+        table = pa.Table.from_pandas(preview, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(
+            content=sink.getvalue().to_pybytes(),
+            media_type=ARROW_STREAM_MEDIA_TYPE,
+            headers={"X-Total-Rows": str(total_rows)}
+        )
+    
+    # Encoded chunk by chunk as the client reads, so large previews never
+    # sit in memory as one JSON document
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _stream_preview_ndjson(preview),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"X-Total-Rows": str(total_rows)}
+        )
     
-    # Format columns
+    # Format columns (dtypes read in one pass, no per-column Series)
     columns = [
         {
             "name": col,
-            "type": str(df[col].dtype),
+            "type": _dtype_name(dtype),
         }
-        for col in df.columns
+        for col, dtype in preview.dtypes.items()
     ]
     
-    # Format rows
-    rows_data = df.to_dict('records')
-    
-    return {
+    # Values are encoded by orjson: shortest round-trip floats (NaN/inf as
+    # null) and datetimes via isoformat(). pandas' to_json is avoided, as it
+    # rounds floats to a fixed number of decimals
+    payload = {
         "dataset_id": dataset_id,
         "columns": columns,
-        "rows": rows_data,
-        "total_rows": len(df),
-        "preview_rows": len(rows_data),
+        "total_rows": total_rows,
+        "preview_rows": len(preview),
     }
+    if layout == "columns":
+        # Column names sent once, values as flat arrays
+        payload["data"] = {col: _column_values(values) for col, values in preview.items()}
+    else:
+        payload["rows"] = preview.to_dict(orient="records")
+    
+    return SafeJSONResponse(payload)
 
 @router.get("/{dataset_id}/quality")
-async def get_dataset_quality(dataset_id: str = Path(...), db: Session = Depends(get_db)):
-    """Get REAL data quality analysis with detailed metrics"""
-    dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
-    if not dataset:
-        return {"error": "Dataset not found"}
+def get_dataset_quality(dataset_id: str = Path(...), detailed: bool = True, db: Session = Depends(get_db)):
+    """
+    Get REAL data quality analysis with detailed metrics
     
-    df = None
+    `detailed=false` answers from the Parquet snapshot's footer statistics
+    without reading any data: row and missing counts only, with the
+    distinct/duplicate-based fields null.
+    """
+    # Existence check only
+    dataset = db.query(Dataset.id).filter(Dataset.id == dataset_id).first()
+    if not dataset:
+        return DATASET_NOT_FOUND_ERROR
     
-    # Load from cache or file
-    if dataset_id in dataset_cache:
-        df = dataset_cache[dataset_id]
-    else:
-        file_path = f"{UPLOAD_DIR}/{dataset_id}.csv"
-        if os.path.exists(file_path):
-            try:
-                df = pd.read_csv(file_path)
-                dataset_cache[dataset_id] = df
-            except:
-                pass
+    # A frame already in memory is used as is. Otherwise the footer answers
+    # non-detailed requests, and polars scans the snapshot rather than
+    # loading it whole into pandas. Before the snapshot exists, the CSV is
+    # parsed by pandas
+    try:
+        df = dataset_cache.get(dataset_id)
+        stats = None
+        if not detailed and df is None and HAS_PYARROW:
+            stats = _footer_quality_stats(dataset_id)
+        if stats is None and df is None and HAS_POLARS:
+            stats = _scan_quality_stats(dataset_id)
+        if stats is None:
+            if df is None:
+                df = load_dataset_frame(dataset_id)
+            stats = _frame_quality_stats(df) if df is not None else None
+    except DATASET_READ_ERRORS as e:
+        logger.warning("Could not read dataset %s: %s", dataset_id, e)
+        stats = None
+    except Exception:
+        logger.exception("Quality analysis failed for dataset %s", dataset_id)
+        raise HTTPException(**QUALITY_FAILED)
     
-    if df is None or df.empty:
-        return {"error": "No data available"}
+    if stats is None or stats["total_rows"] == 0 or not stats["columns"]:
+        return NO_DATA_ERROR
     
     # Calculate REAL statistics
-    total_rows = len(df)
-    total_cells = df.size
-    missing_cells = df.isnull().sum().sum()
-    duplicate_rows = df.duplicated().sum()
+    total_rows = stats["total_rows"]
+    total_columns = len(stats["columns"])
+    total_cells = total_rows * total_columns
+    missing_cells = sum(stats["null_counts"])
+    duplicate_rows = stats["duplicate_rows"]
     
     # Calculate metrics
     missing_percentage = (missing_cells / total_cells * 100) if total_cells > 0 else 0
     completeness = 100 - missing_percentage
-    uniqueness = 100 - (duplicate_rows / total_rows * 100) if total_rows > 0 else 100
     consistency = 100
+    if duplicate_rows is None:
+        uniqueness = None
+        overall_quality_score = None
+    else:
+        duplicate_rows = int(duplicate_rows)
+        uniqueness = float(100 - (duplicate_rows / total_rows * 100) if total_rows > 0 else 100)
+        overall_quality_score = round((completeness + uniqueness + consistency) / 3, 2)
     
     # Per-column quality
     column_quality = []
-    for col in df.columns:
-        col_missing = df[col].isnull().sum()
-        col_total = len(df[col])
-        col_missing_pct = (col_missing / col_total * 100) if col_total > 0 else 0
+    for (col, dtype), col_missing, col_unique in zip(
+        stats["columns"], stats["null_counts"], stats["unique_counts"]
+    ):
+        col_missing_pct = (col_missing / total_rows * 100) if total_rows > 0 else 0
         
         column_quality.append({
             "name": col,
-            "data_type": str(df[col].dtype),
+            "data_type": dtype,
             "missing_count": int(col_missing),
             "missing_percentage": float(col_missing_pct),
-            "unique_count": int(df[col].nunique()),
+            "unique_count": int(col_unique) if col_unique is not None else None,
         })
     
     return {
         "dataset_id": dataset_id,
         "total_rows": total_rows,
-        "total_columns": len(df.columns),
-        "duplicate_rows": int(duplicate_rows),
+        "total_columns": total_columns,
+        "duplicate_rows": duplicate_rows,
         "missing_percentage": float(missing_percentage),
         "completeness": float(completeness),
-        "uniqueness": float(uniqueness),
+        "uniqueness": uniqueness,
         "consistency": float(consistency),
-        "overall_quality_score": round((completeness + uniqueness + consistency) / 3, 2),
+        "overall_quality_score": overall_quality_score,
+        # True when unique_count and duplicate_rows are estimates (very large datasets)
+        "approximate": stats["approximate"],
         "column_quality": column_quality
     }
@@ -1,18 +1,35 @@
 """Datasources API Routes"""
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from uuid import uuid4
 from datetime import datetime
 from app.core.database import get_db
+from app.core.serializer_utils import ORJSONResponse
 from app.models.models import Datasource
 
 router = APIRouter(prefix="/api/datasources", tags=["Datasources"])
 
+# Columns returned by list_datasources; rows come back as tuples, not
+# entities, and the stored password is never read
+DATASOURCE_LIST_COLUMNS = (
+    Datasource.id,
+    Datasource.name,
+    Datasource.type,
+    Datasource.description,
+    Datasource.project_id,
+    Datasource.host,
+    Datasource.port,
+    Datasource.database_name,
+    Datasource.username,
+    Datasource.created_at,
+)
+
 @router.get("/")
 async def list_datasources(db: Session = Depends(get_db)):
     """List all datasources"""
-    datasources = db.query(Datasource).all()
-    return [
+    datasources = db.execute(select(*DATASOURCE_LIST_COLUMNS)).all()
+    return ORJSONResponse([
         {
             "id": ds.id,
             "name": ds.name,
@@ -26,7 +43,7 @@ async def list_datasources(db: Session = Depends(get_db)):
             "created_at": ds.created_at.isoformat() if ds.created_at else ""
         }
         for ds in datasources
-    ]
+    ])
 
 @router.post("/")
 async def create_datasource(data: dict, db: Session = Depends(get_db)):
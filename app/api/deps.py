@@ -0,0 +1,102 @@
+"""
+Shared API Dependencies
+Single definition of the auth dependency used by every router
+"""
+
+import json
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status, Header
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.database import get_db
+from app.core.cache import cache_manager
+from app.models.models import User
+from app.core.auth import decode_token, extract_token_from_header, get_cached_user, cache_user, invalidate_cached_user
+
+# Static auth errors, as HTTPException arguments. Each failure raises a new
+# exception: a shared instance would collect every raise's traceback and
+# keep the request frames in it alive
+AUTH_MISSING = dict(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Missing or invalid authorization header"
+)
+AUTH_INVALID = dict(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid or expired token"
+)
+USER_NOT_FOUND = dict(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="User not found"
+)
+
+# Users are shared across workers through the cache (Redis when available).
+# Only public columns are cached; password_hash never leaves the database.
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_FIELDS = ("id", "username", "email")
+
+
+def _user_cache_key(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    """Drop a user's cache entries whenever the row changes"""
+    cache_manager.delete_sync(_user_cache_key(target.id))
+    invalidate_cached_user(target.id)
+
+
+def load_user(db: Session, user_id: str) -> Optional[User]:
+    """Load a User by id, checking the shared cache before the database"""
+    key = _user_cache_key(user_id)
+    cached = cache_manager.get_sync(key)
+    if cached is not None:
+        # merge(load=False) only accepts detached instances, not new ones
+        user = User(**json.loads(cached))
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        cache_manager.set_sync(
+            key,
+            {field: getattr(user, field) for field in USER_CACHE_FIELDS},
+            ttl=USER_CACHE_TTL_SECONDS
+        )
+    return user
+
+
+def get_current_user(
+    request: Request,
+    authorization: str = Header(None),
+    db: Session = Depends(get_db)
+) -> User:
+    """Extract and verify user from Authorization header"""
+    # Already resolved by AuthContextMiddleware
+    state_user = getattr(request.state, "user", None)
+    if state_user is not None:
+        return db.merge(state_user, load=False)
+    
+    token = extract_token_from_header(authorization)
+    
+    if not token:
+        raise HTTPException(**AUTH_MISSING)
+    
+    cached_user = get_cached_user(token)
+    if cached_user is not None:
+        return db.merge(cached_user, load=False)
+    
+    payload = decode_token(token)
+    if not payload or not payload.get("user_id"):
+        raise HTTPException(**AUTH_INVALID)
+    
+    user = load_user(db, payload["user_id"])
+    if not user:
+        raise HTTPException(**USER_NOT_FOUND)
+    
+    cache_user(token, user, payload.get("exp"))
+    request.state.user = user
+    return user
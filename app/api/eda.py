@@ -4,15 +4,19 @@ import pandas as pd
 import numpy as np
 import logging
 from datetime import datetime
+from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 from app.core.database import get_db
 from app.core.cache import cache_manager
+from app.core.auth import decode_token, extract_token_from_header
+from app.core.activity_buffer import activity_buffer
 from app.core.serializer_utils import safe_json_dumps
 from app.core.universal_eda_analyzer import UniversalEDAAnalyzer
 from app.core.phase2_statistics_extended import Phase2StatisticsExtended
-from app.models.models import EdaResult
+from app.models.models import Dataset, EdaResult
+from app.api.datasets import load_dataset_frame
 from app.schemas.eda_schemas import (
     AnalysisRequest, AnalysisResponse, JobStatusResponse, HealthResponse,
     SummaryResponse, StatisticsSimpleResponse, QualityResponse, CorrelationsResponse
@@ -22,6 +26,8 @@ from app.schemas.eda_schemas import (
 router = APIRouter(prefix="/api/eda", tags=["EDA"])
 logger = logging.getLogger(__name__)
 
+DATASET_NOT_FOUND = dict(status_code=404, detail="Dataset not found")
+
 # ============================================================================
 # AUTH HELPERS
 # ============================================================================
@@ -39,46 +45,42 @@ def get_current_user(request: Request):
 
 def get_user_id_from_token(request: Request) -> str:
     """Extract user_id from JWT token without database lookup"""
-    try:
-        auth_header = request.headers.get("authorization") or request.headers.get("Authorization")
-        if not auth_header:
-            return "mock-user-id"
-        # In production, decode JWT here
-        # For now, return mock user
-        return "mock-user-id"
-    except:
-        return "mock-user-id"
+    # Resolved from the verified-token cache by AuthContextMiddleware
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user.id
+    
+    token = extract_token_from_header(request.headers.get("authorization"))
+    payload = decode_token(token) if token else None
+    if payload and payload.get("user_id"):
+        return payload["user_id"]
+    return "mock-user-id"
 
 # ============================================================================
 # BACKGROUND TASK: ACTUAL EDA ANALYSIS
 # ============================================================================
 
-async def run_eda_analysis(job_id: str, dataset_id: str, db: Session):
-    """Background task to run EDA analysis and store in database"""
+def run_eda_analysis(job_id: str, dataset_id: str, db: Session):
+    """
+    Background task to run EDA analysis and store in database
+    
+    Sync, so Starlette runs it in the threadpool instead of on the event loop
+    """
     try:
-        from app.api.datasets import dataset_cache, UPLOAD_DIR
-        import os
-
-        file_path = f"{UPLOAD_DIR}/{dataset_id}.csv"
-
         # Get original job data
-        original_job_data = await cache_manager.get(f"eda:job:{job_id}")
+        original_job_data = cache_manager.get_sync(f"eda:job:{job_id}")
         if not original_job_data:
-            logger.error(f"❌ Original job not found: {job_id}")
+            logger.error("Original job not found: %s", job_id)
             return
 
         original_job = original_job_data if isinstance(original_job_data, dict) else json.loads(original_job_data)
 
         # Load dataset
-        if dataset_id in dataset_cache:
-            df = dataset_cache[dataset_id]
-        elif os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-            dataset_cache[dataset_id] = df
-        else:
+        df = load_dataset_frame(dataset_id)
+        if df is None:
             failed_job = {**original_job, "status": "failed", "error": "Dataset file not found", "progress": 0}
-            await cache_manager.set(f"eda:job:{job_id}", failed_job, ttl=86400)
-            logger.error(f"❌ Dataset file not found: {file_path}")
+            cache_manager.set_sync(f"eda:job:{job_id}", failed_job, ttl=86400)
+            logger.error("Dataset file not found: %s", dataset_id)
             return
 
         # Update job status
@@ -89,7 +91,7 @@ async def run_eda_analysis(job_id: str, dataset_id: str, db: Session):
             "progress": 25,
             "updated_at": datetime.utcnow().isoformat()
         }
-        await cache_manager.set(f"eda:job:{job_id}", processing_job, ttl=86400)
+        cache_manager.set_sync(f"eda:job:{job_id}", processing_job, ttl=86400)
 
         # ✅ UNIVERSAL ANALYSIS (Works with ANY dataset!)
         analyzer = UniversalEDAAnalyzer(df)
@@ -121,11 +123,17 @@ async def run_eda_analysis(job_id: str, dataset_id: str, db: Session):
             }
         }
 
-        await cache_manager.set(f"eda:job:{job_id}", analysis_result, ttl=86400)
+        cache_manager.set_sync(f"eda:job:{job_id}", analysis_result, ttl=86400)
 
         # ✅ STORE IN DATABASE (with safe JSON serialization)
         try:
-            existing = db.query(EdaResult).filter(EdaResult.dataset_id == dataset_id).first()
+            # Every result column is overwritten below, so none are loaded
+            existing = (
+                db.query(EdaResult)
+                .options(load_only(EdaResult.id))
+                .filter(EdaResult.dataset_id == dataset_id)
+                .first()
+            )
 
             if existing:
                 existing.summary = safe_json_dumps(summary_data)
@@ -134,7 +142,7 @@ async def run_eda_analysis(job_id: str, dataset_id: str, db: Session):
                 existing.correlations = safe_json_dumps(correlations_data)
                 existing.analysis_status = "completed"
                 db.commit()
-                logger.info(f"✅ Updated EDA results in database for: {dataset_id}")
+                logger.info("Updated EDA results in database for: %s", dataset_id)
             else:
                 user_id = original_job.get("user_id", "mock-user-id")
                 eda_result = EdaResult(
@@ -148,17 +156,17 @@ async def run_eda_analysis(job_id: str, dataset_id: str, db: Session):
                 )
                 db.add(eda_result)
                 db.commit()
-                logger.info(f"✅ Stored EDA results in database for: {dataset_id}")
+                logger.info("Stored EDA results in database for: %s", dataset_id)
         except Exception as db_error:
-            logger.error(f"❌ Database error: {str(db_error)}")
+            logger.error("Database error: %s", db_error)
             db.rollback()
             raise
 
-        logger.info(f"✅ EDA analysis completed: {job_id}")
+        logger.info("EDA analysis completed: %s", job_id)
 
     except Exception as e:
-        logger.error(f"❌ EDA analysis failed: {str(e)}", exc_info=True)
-        original_job_data = await cache_manager.get(f"eda:job:{job_id}")
+        logger.error("EDA analysis failed: %s", e, exc_info=True)
+        original_job_data = cache_manager.get_sync(f"eda:job:{job_id}")
         if original_job_data:
             original_job = original_job_data if isinstance(original_job_data, dict) else json.loads(original_job_data)
             failed_job = {
@@ -180,7 +188,7 @@ async def run_eda_analysis(job_id: str, dataset_id: str, db: Session):
                 "created_at": datetime.utcnow().isoformat(),
                 "updated_at": datetime.utcnow().isoformat()
             }
-        await cache_manager.set(f"eda:job:{job_id}", failed_job, ttl=86400)
+        cache_manager.set_sync(f"eda:job:{job_id}", failed_job, ttl=86400)
 
 
 # ============================================================================
@@ -190,7 +198,7 @@ async def run_eda_analysis(job_id: str, dataset_id: str, db: Session):
 @router.get("/health", response_model=HealthResponse, status_code=status.HTTP_200_OK, tags=["Health"])
 async def eda_health_check():
     """✅ EDA Service Health Check"""
-    logger.info(f"🏥 EDA health check requested")
+    logger.info("🏥 EDA health check requested")
     return {
         "status": "healthy",
         "service": "EDA Engine",
@@ -216,21 +224,19 @@ async def start_eda_analysis(
 ):
     """✅ Start EDA Analysis - Returns job_id for polling"""
     try:
-        logger.info(f"📊 EDA analysis requested for dataset: {dataset_id}")
+        logger.info("📊 EDA analysis requested for dataset: %s", dataset_id)
 
         user_id = get_user_id_from_token(request)
-        logger.info(f"👤 User authenticated: {user_id}")
+        logger.info("👤 User authenticated: %s", user_id)
 
         # Verify dataset exists
-        from app.models.models import Dataset
-        dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+        dataset = db.query(Dataset.file_name).filter(Dataset.id == dataset_id).first()
         if not dataset:
-            raise HTTPException(status_code=404, detail="Dataset not found")
+            raise HTTPException(**DATASET_NOT_FOUND)
 
-        logger.info(f"✅ Dataset verified: {dataset.file_name}")
+        logger.info("✅ Dataset verified: %s", dataset.file_name)
 
         # Create job
-        from uuid import uuid4
         job_id = str(uuid4())
 
         job_data = {
@@ -245,24 +251,21 @@ async def start_eda_analysis(
         }
 
         await cache_manager.set(f"eda:job:{job_id}", job_data, ttl=86400)
-        logger.info(f"🔄 Job created: {job_id}")
+        logger.info("🔄 Job created: %s", job_id)
 
         # Log activity
-        from app.models.models import Activity
-        activity = Activity(
+        activity_buffer.add(
             user_id=user_id,
             action="analysis_started",
             entity_type="dataset",
             entity_id=dataset_id,
             details=json.dumps({"job_id": job_id})
         )
-        db.add(activity)
-        db.commit()
-        logger.info(f"📝 Activity logged")
+        logger.info("📝 Activity logged")
 
         # Start background task
         background_tasks.add_task(run_eda_analysis, job_id, dataset_id, db)
-        logger.info(f"🚀 Background analysis task started for job: {job_id}")
+        logger.info("🚀 Background analysis task started for job: %s", job_id)
 
         return {
             "job_id": job_id,
@@ -274,7 +277,7 @@ async def start_eda_analysis(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error starting analysis: {str(e)}", exc_info=True)
+        logger.error("❌ Error starting analysis: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
@@ -290,14 +293,14 @@ async def start_eda_analysis(
 async def get_job_status(request: Request, job_id: str, db: Session = Depends(get_db)):
     """✅ Get Job Status - Check analysis progress"""
     try:
-        logger.info(f"🔍 Job status requested: {job_id}")
+        logger.info("🔍 Job status requested: %s", job_id)
 
         user_id = get_user_id_from_token(request)
 
         job_data = await cache_manager.get(f"eda:job:{job_id}")
 
         if not job_data:
-            logger.warning(f"⚠️ Job not found: {job_id}")
+            logger.warning("⚠️ Job not found: %s", job_id)
             raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found or expired")
 
         job = job_data if isinstance(job_data, dict) else json.loads(job_data)
@@ -307,14 +310,14 @@ async def get_job_status(request: Request, job_id: str, db: Session = Depends(ge
         job.setdefault("dataset_id", job.get("dataset_id", "unknown"))
         job.setdefault("created_at", job.get("created_at", datetime.utcnow().isoformat()))
 
-        logger.info(f"✅ Job status: {job['status']} (progress: {job.get('progress', 0)}%)")
+        logger.info("✅ Job status: %s (progress: %s%%)", job['status'], job.get('progress', 0))
 
         return JobStatusResponse(**job)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error fetching job status: {str(e)}", exc_info=True)
+        logger.error("❌ Error fetching job status: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to get job status: {str(e)}")
 
 # ============================================================================
@@ -329,27 +332,28 @@ async def get_job_status(request: Request, job_id: str, db: Session = Depends(ge
 async def get_summary(request: Request, dataset_id: str, db: Session = Depends(get_db)):
     """✅ Get Data Summary - Basic profile from database"""
     try:
-        logger.info(f"📋 Summary requested for dataset: {dataset_id}")
+        logger.info("📋 Summary requested for dataset: %s", dataset_id)
 
         user_id = get_user_id_from_token(request)
 
-        result = db.query(EdaResult).filter(EdaResult.dataset_id == dataset_id).first()
+        # Only the column being returned; the other result blobs stay in the DB
+        stored = db.query(EdaResult.summary).filter(EdaResult.dataset_id == dataset_id).scalar()
 
-        if not result or not result.summary:
-            logger.warning(f"⚠️ Summary not found for dataset: {dataset_id}")
+        if not stored:
+            logger.warning("⚠️ Summary not found for dataset: %s", dataset_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Summary not found. Run analysis first using POST /dataset/{id}/analyze"
             )
 
-        summary = json.loads(result.summary)
-        logger.info(f"✅ Summary retrieved from database")
+        summary = json.loads(stored)
+        logger.info("✅ Summary retrieved from database")
         return summary
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error fetching summary: {str(e)}")
+        logger.error("❌ Error fetching summary: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get summary: {str(e)}")
 
 # ============================================================================
@@ -364,27 +368,27 @@ async def get_summary(request: Request, dataset_id: str, db: Session = Depends(g
 async def get_statistics(request: Request, dataset_id: str, db: Session = Depends(get_db)):
     """✅ Get Statistics - Descriptive statistics from database"""
     try:
-        logger.info(f"📊 Statistics requested for dataset: {dataset_id}")
+        logger.info("📊 Statistics requested for dataset: %s", dataset_id)
 
         user_id = get_user_id_from_token(request)
 
-        result = db.query(EdaResult).filter(EdaResult.dataset_id == dataset_id).first()
+        stored = db.query(EdaResult.statistics).filter(EdaResult.dataset_id == dataset_id).scalar()
 
-        if not result or not result.statistics:
-            logger.warning(f"⚠️ Statistics not found for dataset: {dataset_id}")
+        if not stored:
+            logger.warning("⚠️ Statistics not found for dataset: %s", dataset_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Statistics not found. Run analysis first using POST /dataset/{id}/analyze"
             )
 
-        statistics = json.loads(result.statistics)
-        logger.info(f"✅ Statistics retrieved from database")
+        statistics = json.loads(stored)
+        logger.info("✅ Statistics retrieved from database")
         return statistics
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error fetching statistics: {str(e)}")
+        logger.error("❌ Error fetching statistics: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
 
 # ============================================================================
@@ -399,27 +403,27 @@ async def get_statistics(request: Request, dataset_id: str, db: Session = Depend
 async def get_quality_report(request: Request, dataset_id: str, db: Session = Depends(get_db)):
     """✅ Get Quality Report - Data quality metrics from database"""
     try:
-        logger.info(f"🔍 Quality report requested for dataset: {dataset_id}")
+        logger.info("🔍 Quality report requested for dataset: %s", dataset_id)
 
         user_id = get_user_id_from_token(request)
 
-        result = db.query(EdaResult).filter(EdaResult.dataset_id == dataset_id).first()
+        stored = db.query(EdaResult.quality).filter(EdaResult.dataset_id == dataset_id).scalar()
 
-        if not result or not result.quality:
-            logger.warning(f"⚠️ Quality report not found for dataset: {dataset_id}")
+        if not stored:
+            logger.warning("⚠️ Quality report not found for dataset: %s", dataset_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Quality report not found. Run analysis first using POST /dataset/{id}/analyze"
             )
 
-        quality = json.loads(result.quality)
-        logger.info(f"✅ Quality report retrieved from database")
+        quality = json.loads(stored)
+        logger.info("✅ Quality report retrieved from database")
         return quality
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error fetching quality report: {str(e)}")
+        logger.error("❌ Error fetching quality report: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get quality report: {str(e)}")
 
 # ============================================================================
@@ -434,49 +438,42 @@ async def get_quality_report(request: Request, dataset_id: str, db: Session = De
 async def get_correlations(request: Request, dataset_id: str, threshold: float = 0.3, db: Session = Depends(get_db)):
     """✅ Get Correlations - Correlation matrix from database"""
     try:
-        logger.info(f"🔗 Correlations requested for dataset: {dataset_id} (threshold: {threshold})")
+        logger.info("🔗 Correlations requested for dataset: %s (threshold: %s)", dataset_id, threshold)
 
         user_id = get_user_id_from_token(request)
 
-        result = db.query(EdaResult).filter(EdaResult.dataset_id == dataset_id).first()
+        stored = db.query(EdaResult.correlations).filter(EdaResult.dataset_id == dataset_id).scalar()
 
-        if not result or not result.correlations:
-            logger.warning(f"⚠️ Correlations not found for dataset: {dataset_id}")
+        if not stored:
+            logger.warning("⚠️ Correlations not found for dataset: %s", dataset_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Correlations not found. Run analysis first using POST /dataset/{id}/analyze"
             )
 
-        correlations = json.loads(result.correlations)
-        logger.info(f"✅ Correlations retrieved from database")
+        correlations = json.loads(stored)
+        logger.info("✅ Correlations retrieved from database")
         return correlations
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error fetching correlations: {str(e)}")
+        logger.error("❌ Error fetching correlations: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get correlations: {str(e)}")
 
 
 # ============================================================================
 # PHASE 2: ADVANCED STATISTICS & VISUALIZATIONS
 # ============================================================================
+# Endpoints below are plain def: FastAPI runs them in its threadpool, so the
+# pandas work doesn't block the event loop
 
 def load_dataset_for_phase2(dataset_id: str) -> pd.DataFrame:
     """Load dataset from cache or file for Phase 2 analysis"""
-    from app.api.datasets import dataset_cache, UPLOAD_DIR
-    import os
-
-    file_path = f"{UPLOAD_DIR}/{dataset_id}.csv"
-
-    if dataset_id in dataset_cache:
-        return dataset_cache[dataset_id]
-    elif os.path.exists(file_path):
-        df = pd.read_csv(file_path)
-        dataset_cache[dataset_id] = df
-        return df
-    else:
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    df = load_dataset_frame(dataset_id)
+    if df is None:
+        raise HTTPException(**DATASET_NOT_FOUND)
+    return df
 
 
 # ============================================================================
@@ -484,7 +481,7 @@ def load_dataset_for_phase2(dataset_id: str) -> pd.DataFrame:
 # ============================================================================
 
 @router.get("/{dataset_id}/phase2/histograms", status_code=status.HTTP_200_OK, tags=["Phase 2 - Statistics"])
-async def get_phase2_histograms(
+def get_phase2_histograms(
         request: Request,
         dataset_id: str,
         bins: int = 15,
@@ -492,21 +489,21 @@ async def get_phase2_histograms(
 ):
     """✅ Phase 2: Get histogram data for visualization"""
     try:
-        logger.info(f"📊 Phase 2 Histograms requested for dataset: {dataset_id}")
+        logger.info("📊 Phase 2 Histograms requested for dataset: %s", dataset_id)
 
         df = load_dataset_for_phase2(dataset_id)
         phase2 = Phase2StatisticsExtended(df)
         histogram_data = phase2.get_histograms(bins=bins)
         histogram_data["dataset_id"] = dataset_id
 
-        await cache_manager.set(f"phase2:histograms:{dataset_id}", safe_json_dumps(histogram_data), ttl=86400)
-        logger.info(f"✅ Generated {histogram_data['successfully_generated']} histograms")
+        cache_manager.set_sync(f"phase2:histograms:{dataset_id}", safe_json_dumps(histogram_data), ttl=86400)
+        logger.info("✅ Generated %s histograms", histogram_data['successfully_generated'])
         return histogram_data
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error generating histograms: {str(e)}")
+        logger.error("❌ Error generating histograms: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -515,28 +512,28 @@ async def get_phase2_histograms(
 # ============================================================================
 
 @router.get("/{dataset_id}/phase2/outliers", status_code=status.HTTP_200_OK, tags=["Phase 2 - Outliers"])
-async def get_phase2_outliers(
+def get_phase2_outliers(
         request: Request,
         dataset_id: str,
         db: Session = Depends(get_db)
 ):
     """✅ Phase 2: Detect outliers using IQR method"""
     try:
-        logger.info(f"🔍 Phase 2 Outliers requested for dataset: {dataset_id}")
+        logger.info("🔍 Phase 2 Outliers requested for dataset: %s", dataset_id)
 
         df = load_dataset_for_phase2(dataset_id)
         phase2 = Phase2StatisticsExtended(df)
         outliers_data = phase2.get_outliers()
         outliers_data["dataset_id"] = dataset_id
 
-        await cache_manager.set(f"phase2:outliers:{dataset_id}", safe_json_dumps(outliers_data), ttl=86400)
-        logger.info(f"✅ Outlier detection completed")
+        cache_manager.set_sync(f"phase2:outliers:{dataset_id}", safe_json_dumps(outliers_data), ttl=86400)
+        logger.info("✅ Outlier detection completed")
         return outliers_data
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error detecting outliers: {str(e)}")
+        logger.error("❌ Error detecting outliers: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -545,28 +542,28 @@ async def get_phase2_outliers(
 # ============================================================================
 
 @router.get("/{dataset_id}/phase2/normality", status_code=status.HTTP_200_OK, tags=["Phase 2 - Tests"])
-async def get_phase2_normality(
+def get_phase2_normality(
         request: Request,
         dataset_id: str,
         db: Session = Depends(get_db)
 ):
     """✅ Phase 2: Test normality of numeric columns (Shapiro-Wilk)"""
     try:
-        logger.info(f"📈 Phase 2 Normality tests requested for dataset: {dataset_id}")
+        logger.info("📈 Phase 2 Normality tests requested for dataset: %s", dataset_id)
 
         df = load_dataset_for_phase2(dataset_id)
         phase2 = Phase2StatisticsExtended(df)
         normality_data = phase2.get_normality_tests()
         normality_data["dataset_id"] = dataset_id
 
-        await cache_manager.set(f"phase2:normality:{dataset_id}", safe_json_dumps(normality_data), ttl=86400)
-        logger.info(f"✅ Normality tests completed")
+        cache_manager.set_sync(f"phase2:normality:{dataset_id}", safe_json_dumps(normality_data), ttl=86400)
+        logger.info("✅ Normality tests completed")
         return normality_data
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error running normality tests: {str(e)}")
+        logger.error("❌ Error running normality tests: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -575,28 +572,28 @@ async def get_phase2_normality(
 # ============================================================================
 
 @router.get("/{dataset_id}/phase2/distributions", status_code=status.HTTP_200_OK, tags=["Phase 2 - Analysis"])
-async def get_phase2_distributions(
+def get_phase2_distributions(
         request: Request,
         dataset_id: str,
         db: Session = Depends(get_db)
 ):
     """✅ Phase 2: Analyze distribution characteristics"""
     try:
-        logger.info(f"🎯 Phase 2 Distribution analysis requested for dataset: {dataset_id}")
+        logger.info("🎯 Phase 2 Distribution analysis requested for dataset: %s", dataset_id)
 
         df = load_dataset_for_phase2(dataset_id)
         phase2 = Phase2StatisticsExtended(df)
         distribution_data = phase2.get_distribution_analysis()
         distribution_data["dataset_id"] = dataset_id
 
-        await cache_manager.set(f"phase2:distributions:{dataset_id}", safe_json_dumps(distribution_data), ttl=86400)
-        logger.info(f"✅ Distribution analysis completed")
+        cache_manager.set_sync(f"phase2:distributions:{dataset_id}", safe_json_dumps(distribution_data), ttl=86400)
+        logger.info("✅ Distribution analysis completed")
         return distribution_data
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error analyzing distributions: {str(e)}")
+        logger.error("❌ Error analyzing distributions: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -605,7 +602,7 @@ async def get_phase2_distributions(
 # ============================================================================
 
 @router.get("/{dataset_id}/phase2/categorical", status_code=status.HTTP_200_OK, tags=["Phase 2 - Categorical"])
-async def get_phase2_categorical(
+def get_phase2_categorical(
         request: Request,
         dataset_id: str,
         top_n: int = 10,
@@ -613,21 +610,21 @@ async def get_phase2_categorical(
 ):
     """✅ Phase 2: Get distribution of categorical columns"""
     try:
-        logger.info(f"📋 Phase 2 Categorical distributions requested for dataset: {dataset_id}")
+        logger.info("📋 Phase 2 Categorical distributions requested for dataset: %s", dataset_id)
 
         df = load_dataset_for_phase2(dataset_id)
         phase2 = Phase2StatisticsExtended(df)
         categorical_data = phase2.get_categorical_distributions(top_n=top_n)
         categorical_data["dataset_id"] = dataset_id
 
-        await cache_manager.set(f"phase2:categorical:{dataset_id}", safe_json_dumps(categorical_data), ttl=86400)
-        logger.info(f"✅ Categorical analysis completed")
+        cache_manager.set_sync(f"phase2:categorical:{dataset_id}", safe_json_dumps(categorical_data), ttl=86400)
+        logger.info("✅ Categorical analysis completed")
         return categorical_data
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error analyzing categorical data: {str(e)}")
+        logger.error("❌ Error analyzing categorical data: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -636,7 +633,7 @@ async def get_phase2_categorical(
 # ============================================================================
 
 @router.get("/{dataset_id}/phase2/correlations-enhanced", status_code=status.HTTP_200_OK, tags=["Phase 2 - Correlations"])
-async def get_phase2_correlations_enhanced(
+def get_phase2_correlations_enhanced(
         request: Request,
         dataset_id: str,
         threshold: float = 0.3,
@@ -644,21 +641,21 @@ async def get_phase2_correlations_enhanced(
 ):
     """✅ Phase 2: Enhanced correlation analysis with p-values"""
     try:
-        logger.info(f"🔗 Phase 2 Enhanced correlations requested for dataset: {dataset_id}")
+        logger.info("🔗 Phase 2 Enhanced correlations requested for dataset: %s", dataset_id)
 
         df = load_dataset_for_phase2(dataset_id)
         phase2 = Phase2StatisticsExtended(df)
         correlation_data = phase2.get_enhanced_correlations(threshold=threshold)
         correlation_data["dataset_id"] = dataset_id
 
-        await cache_manager.set(f"phase2:correlations-enhanced:{dataset_id}", safe_json_dumps(correlation_data), ttl=86400)
-        logger.info(f"✅ Enhanced correlation analysis completed")
+        cache_manager.set_sync(f"phase2:correlations-enhanced:{dataset_id}", safe_json_dumps(correlation_data), ttl=86400)
+        logger.info("✅ Enhanced correlation analysis completed")
         return correlation_data
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error analyzing correlations: {str(e)}")
+        logger.error("❌ Error analyzing correlations: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -667,14 +664,14 @@ async def get_phase2_correlations_enhanced(
 # ============================================================================
 
 @router.get("/{dataset_id}/phase2/complete", status_code=status.HTTP_200_OK, tags=["Phase 2 - Complete"])
-async def get_phase2_complete(
+def get_phase2_complete(
         request: Request,
         dataset_id: str,
         db: Session = Depends(get_db)
 ):
     """✅ Phase 2: Get COMPLETE Phase 2 analysis (all features)"""
     try:
-        logger.info(f"📊 Complete Phase 2 analysis requested for dataset: {dataset_id}")
+        logger.info("📊 Complete Phase 2 analysis requested for dataset: %s", dataset_id)
 
         df = load_dataset_for_phase2(dataset_id)
         phase2 = Phase2StatisticsExtended(df)
@@ -691,12 +688,12 @@ async def get_phase2_complete(
             "correlations_enhanced": phase2.get_enhanced_correlations()
         }
 
-        await cache_manager.set(f"phase2:complete:{dataset_id}", safe_json_dumps(complete_data), ttl=86400)
-        logger.info(f"✅ Complete Phase 2 analysis completed")
+        cache_manager.set_sync(f"phase2:complete:{dataset_id}", safe_json_dumps(complete_data), ttl=86400)
+        logger.info("✅ Complete Phase 2 analysis completed")
         return complete_data
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error generating complete Phase 2 analysis: {str(e)}")
+        logger.error("❌ Error generating complete Phase 2 analysis: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
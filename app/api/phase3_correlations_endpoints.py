@@ -9,112 +9,52 @@ from typing import Optional
 import logging
 from datetime import datetime
 import pandas as pd
-import os
 
 # ✅ Correct imports
 from app.core.phase3_advanced_correlations import AdvancedCorrelationAnalysis
 from app.core.database import get_db
+from app.api.datasets import load_dataset_frame
 from app.models.models import Dataset
 from sqlalchemy.orm import Session
 
+# Endpoints are plain def: FastAPI runs them in its threadpool, so dataset
+# loading and correlation math don't block the event loop
 router = APIRouter(prefix="/api/eda", tags=["Phase 3 - Correlations"])
 logger = logging.getLogger(__name__)
 
 
 def get_dataset_from_db(dataset_id: str, db: Session) -> Optional[pd.DataFrame]:
     """
-    Get dataset from database - CUSTOMIZED for YOUR schema
+    Get a dataset's DataFrame
 
-    Your Dataset model has these attributes:
-    - id: Dataset ID
-    - project_id: Project reference
-    - file_name: ✅ THE FILE PATH/NAME
-    - created_at: Creation timestamp
-    - description: Description text
-    - name: Dataset name
-    - file_size_bytes: File size
+    Loaded through load_dataset_frame, so phase 3 shares the in-memory frame
+    cache and Parquet snapshot with the other dataset endpoints and parses
+    the upload the same way.
 
     Args:
         dataset_id: The dataset ID
         db: Database session (dependency injection)
 
     Returns:
-        pandas DataFrame or None if not found
+        pandas DataFrame or None if the dataset or its file doesn't exist
     """
-    try:
-        logger.info(f"📂 Retrieving dataset: {dataset_id}")
-
-        # Query the database using the session
-        dataset_record = db.query(Dataset).filter(
-            Dataset.id == dataset_id
-        ).first()
-
-        if not dataset_record:
-            logger.warning(f"⚠️ Dataset not found: {dataset_id}")
-            return None
-
-        # ✅ YOUR SCHEMA: Use file_name attribute
-        file_path = None
-
-        # Try primary attribute first (YOUR schema)
-        if hasattr(dataset_record, 'file_name') and dataset_record.file_name:
-            file_path = dataset_record.file_name
-            logger.info(f"✅ Found file path in attribute: 'file_name'")
-
-        # Fallback to other common attributes if needed
-        if not file_path:
-            possible_attributes = [
-                'file_path',      # Alternative names
-                'storage_path',
-                'path',
-                'file_location',
-                'upload_path',
-                'data_path',
-                'filepath'
-            ]
-
-            for attr_name in possible_attributes:
-                if hasattr(dataset_record, attr_name):
-                    potential_path = getattr(dataset_record, attr_name)
-                    if potential_path:
-                        file_path = potential_path
-                        logger.info(f"✅ Found file path in attribute: '{attr_name}'")
-                        break
-
-        # If still no file path found, log available attributes
-        if not file_path:
-            available_attrs = [k for k in dataset_record.__dict__.keys() if not k.startswith('_')]
-            logger.error(f"❌ No file path found in Dataset attributes")
-            logger.error(f"   Available: {available_attrs}")
-            logger.error(f"   Expected one of: file_name, file_path, storage_path, path, file_location")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Cannot determine file path. Dataset attributes: {available_attrs}"
-            )
-
-        # Verify file exists
-        if not os.path.exists(file_path):
-            logger.error(f"❌ File not found at path: {file_path}")
-            logger.error(f"   File path type: {type(file_path)}")
-            logger.error(f"   File path value: {file_path}")
-            raise HTTPException(status_code=500, detail=f"Dataset file not found: {file_path}")
-
-        # Load the CSV file
-        logger.info(f"📖 Loading CSV from: {file_path}")
-        df = pd.read_csv(file_path)
-        logger.info(f"✅ Loaded dataset {dataset_id} with shape {df.shape}")
-        return df
+    if db.query(Dataset.id).filter(Dataset.id == dataset_id).first() is None:
+        logger.warning("Dataset not found: %s", dataset_id)
+        return None
 
-    except HTTPException:
-        raise
+    try:
+        df = load_dataset_frame(dataset_id)
     except Exception as e:
-        logger.error(f"❌ Error retrieving dataset {dataset_id}: {str(e)}")
-        logger.error(f"   Exception type: {type(e).__name__}")
+        logger.error("Error retrieving dataset %s: %s", dataset_id, e)
         return None
 
+    if df is None:
+        logger.warning("Dataset file not found: %s", dataset_id)
+    return df
+
 
 @router.get("/{dataset_id}/phase3/correlations/enhanced")
-async def get_enhanced_correlations(
+def get_enhanced_correlations(
         dataset_id: str,
         threshold: float = Query(0.3, ge=0.0, le=1.0),
         db: Session = Depends(get_db)
@@ -138,7 +78,7 @@ async def get_enhanced_correlations(
     Response time: ~200-300ms
     """
     try:
-        logger.info(f"📊 Enhanced correlations requested for dataset: {dataset_id}")
+        logger.info("📊 Enhanced correlations requested for dataset: %s", dataset_id)
 
         # Get dataset
         df = get_dataset_from_db(dataset_id, db)
@@ -150,7 +90,7 @@ async def get_enhanced_correlations(
         analyzer = AdvancedCorrelationAnalysis(df)
         results = analyzer.get_enhanced_correlations(threshold=threshold)
 
-        logger.info(f"✅ Enhanced correlations analysis completed")
+        logger.info("✅ Enhanced correlations analysis completed")
 
         return {
             "dataset_id": dataset_id,
@@ -164,12 +104,12 @@ async def get_enhanced_correlations(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error in enhanced correlations: {str(e)}")
+        logger.error("❌ Error in enhanced correlations: %s", e)
         raise HTTPException(status_code=500, detail=f"Error analyzing correlations: {str(e)}")
 
 
 @router.get("/{dataset_id}/phase3/correlations/vif")
-async def get_vif_analysis(
+def get_vif_analysis(
         dataset_id: str,
         db: Session = Depends(get_db)
 ) -> dict:
@@ -191,7 +131,7 @@ async def get_vif_analysis(
     Response time: ~250-350ms
     """
     try:
-        logger.info(f"📈 VIF analysis requested for dataset: {dataset_id}")
+        logger.info("📈 VIF analysis requested for dataset: %s", dataset_id)
 
         df = get_dataset_from_db(dataset_id, db)
 
@@ -201,7 +141,7 @@ async def get_vif_analysis(
         analyzer = AdvancedCorrelationAnalysis(df)
         vif_results = analyzer.get_vif_analysis()
 
-        logger.info(f"✅ VIF analysis completed")
+        logger.info("✅ VIF analysis completed")
 
         return {
             "dataset_id": dataset_id,
@@ -218,12 +158,12 @@ async def get_vif_analysis(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error in VIF analysis: {str(e)}")
+        logger.error("❌ Error in VIF analysis: %s", e)
         raise HTTPException(status_code=500, detail=f"Error in VIF analysis: {str(e)}")
 
 
 @router.get("/{dataset_id}/phase3/correlations/heatmap-data")
-async def get_heatmap_data(
+def get_heatmap_data(
         dataset_id: str,
         db: Session = Depends(get_db)
 ) -> dict:
@@ -238,7 +178,7 @@ async def get_heatmap_data(
     Response time: ~150-250ms
     """
     try:
-        logger.info(f"🔥 Heatmap data requested for dataset: {dataset_id}")
+        logger.info("🔥 Heatmap data requested for dataset: %s", dataset_id)
 
         df = get_dataset_from_db(dataset_id, db)
 
@@ -248,7 +188,7 @@ async def get_heatmap_data(
         analyzer = AdvancedCorrelationAnalysis(df)
         heatmap_data = analyzer.get_correlation_heatmap_data()
 
-        logger.info(f"✅ Heatmap data generated")
+        logger.info("✅ Heatmap data generated")
 
         return {
             "dataset_id": dataset_id,
@@ -260,12 +200,12 @@ async def get_heatmap_data(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error generating heatmap data: {str(e)}")
+        logger.error("❌ Error generating heatmap data: %s", e)
         raise HTTPException(status_code=500, detail=f"Error generating heatmap: {str(e)}")
 
 
 @router.get("/{dataset_id}/phase3/correlations/clustering")
-async def get_correlation_clustering(
+def get_correlation_clustering(
         dataset_id: str,
         db: Session = Depends(get_db)
 ) -> dict:
@@ -280,7 +220,7 @@ async def get_correlation_clustering(
     Response time: ~300-400ms
     """
     try:
-        logger.info(f"🎯 Correlation clustering requested for dataset: {dataset_id}")
+        logger.info("🎯 Correlation clustering requested for dataset: %s", dataset_id)
 
         df = get_dataset_from_db(dataset_id, db)
 
@@ -290,7 +230,7 @@ async def get_correlation_clustering(
         analyzer = AdvancedCorrelationAnalysis(df)
         clustering = analyzer.get_correlation_clustering()
 
-        logger.info(f"✅ Correlation clustering completed")
+        logger.info("✅ Correlation clustering completed")
 
         return {
             "dataset_id": dataset_id,
@@ -302,12 +242,12 @@ async def get_correlation_clustering(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error in correlation clustering: {str(e)}")
+        logger.error("❌ Error in correlation clustering: %s", e)
         raise HTTPException(status_code=500, detail=f"Error in clustering: {str(e)}")
 
 
 @router.get("/{dataset_id}/phase3/correlations/relationship-insights")
-async def get_relationship_insights(
+def get_relationship_insights(
         dataset_id: str,
         db: Session = Depends(get_db)
 ) -> dict:
@@ -324,7 +264,7 @@ async def get_relationship_insights(
     Response time: ~200-300ms
     """
     try:
-        logger.info(f"🔗 Relationship insights requested for dataset: {dataset_id}")
+        logger.info("🔗 Relationship insights requested for dataset: %s", dataset_id)
 
         df = get_dataset_from_db(dataset_id, db)
 
@@ -334,7 +274,7 @@ async def get_relationship_insights(
         analyzer = AdvancedCorrelationAnalysis(df)
         insights = analyzer.get_relationship_insights()
 
-        logger.info(f"✅ Relationship insights generated")
+        logger.info("✅ Relationship insights generated")
 
         return {
             "dataset_id": dataset_id,
@@ -346,12 +286,12 @@ async def get_relationship_insights(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error generating relationship insights: {str(e)}")
+        logger.error("❌ Error generating relationship insights: %s", e)
         raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
 
 
 @router.get("/{dataset_id}/phase3/correlations/warnings")
-async def get_multicollinearity_warnings(
+def get_multicollinearity_warnings(
         dataset_id: str,
         db: Session = Depends(get_db)
 ) -> dict:
@@ -367,7 +307,7 @@ async def get_multicollinearity_warnings(
     Response time: ~250-350ms
     """
     try:
-        logger.info(f"⚠️ Multicollinearity warnings requested for dataset: {dataset_id}")
+        logger.info("⚠️ Multicollinearity warnings requested for dataset: %s", dataset_id)
 
         df = get_dataset_from_db(dataset_id, db)
 
@@ -377,7 +317,7 @@ async def get_multicollinearity_warnings(
         analyzer = AdvancedCorrelationAnalysis(df)
         warnings = analyzer.get_multicollinearity_warnings()
 
-        logger.info(f"✅ Multicollinearity warnings generated")
+        logger.info("✅ Multicollinearity warnings generated")
 
         return {
             "dataset_id": dataset_id,
@@ -389,12 +329,12 @@ async def get_multicollinearity_warnings(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error generating warnings: {str(e)}")
+        logger.error("❌ Error generating warnings: %s", e)
         raise HTTPException(status_code=500, detail=f"Error generating warnings: {str(e)}")
 
 
 @router.get("/{dataset_id}/phase3/correlations/complete")
-async def get_complete_correlation_analysis(
+def get_complete_correlation_analysis(
         dataset_id: str,
         threshold: float = Query(0.3, ge=0.0, le=1.0),
         db: Session = Depends(get_db)
@@ -419,7 +359,7 @@ async def get_complete_correlation_analysis(
     Response time: ~1-2 seconds (combined)
     """
     try:
-        logger.info(f"📊 Complete correlation analysis requested for dataset: {dataset_id}")
+        logger.info("📊 Complete correlation analysis requested for dataset: %s", dataset_id)
 
         df = get_dataset_from_db(dataset_id, db)
 
@@ -438,7 +378,7 @@ async def get_complete_correlation_analysis(
             "multicollinearity_warnings": analyzer.get_multicollinearity_warnings()
         }
 
-        logger.info(f"✅ Complete correlation analysis finished")
+        logger.info("✅ Complete correlation analysis finished")
 
         return {
             "dataset_id": dataset_id,
@@ -452,5 +392,5 @@ async def get_complete_correlation_analysis(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error in complete correlation analysis: {str(e)}")
+        logger.error("❌ Error in complete correlation analysis: %s", e)
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
\ No newline at end of file
@@ -10,54 +10,20 @@ Endpoints:
 - GET /activities/recent     Get recent activities
 """
 
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from typing import Optional
 import logging
 
 from app.core.database import get_db
 from app.models.models import User
-from app.core.auth import verify_token, extract_token_from_header
+from app.api.deps import get_current_user
 
 logger = logging.getLogger(__name__)
 
 # Create router
 router = APIRouter()
 
-# ============================================================================
-# HELPER FUNCTION - Get current user from token
-# ============================================================================
-
-def get_current_user(
-    authorization: str = Header(None),
-    db: Session = Depends(get_db)
-) -> User:
-    """Extract and verify user from Authorization header"""
-    token = extract_token_from_header(authorization)
-    
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid authorization header"
-        )
-    
-    user_id = verify_token(token)
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    
-    return user
-
-
 # ============================================================================
 # GET RECENT MODELS (Placeholder - Phase 3)
 # ============================================================================
@@ -95,7 +61,7 @@ def get_recent_models(
     ```
     """
     
-    logger.info(f"📊 Getting recent models for user: {current_user.email}")
+    logger.info("Getting recent models for user: %s", current_user.email)
     
     # Placeholder response
     return {
@@ -142,7 +108,7 @@ def get_recent_activities(
     ```
     """
     
-    logger.info(f"📋 Getting recent activities for user: {current_user.email}")
+    logger.info("Getting recent activities for user: %s", current_user.email)
     
     # Placeholder response
     return {
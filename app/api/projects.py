@@ -1,19 +1,30 @@
 """Projects API Routes"""
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from uuid import uuid4
 from datetime import datetime
 from app.core.database import get_db
+from app.core.serializer_utils import ORJSONResponse
 from app.models.models import Project
 from app.schemas import ProjectCreate, ProjectResponse
 
 router = APIRouter(prefix="/api/projects", tags=["Projects"])
 
+# Columns returned by list_projects; rows come back as tuples, not entities
+PROJECT_LIST_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.owner_id,
+    Project.created_at,
+)
+
 @router.get("/", response_model=list)
 async def list_projects(db: Session = Depends(get_db)):
     """List all projects"""
-    projects = db.query(Project).all()
-    return [
+    projects = db.execute(select(*PROJECT_LIST_COLUMNS)).all()
+    return ORJSONResponse([
         {
             "id": p.id,
             "name": p.name,
@@ -22,7 +33,7 @@ async def list_projects(db: Session = Depends(get_db)):
             "created_at": p.created_at.isoformat() if p.created_at else ""
         }
         for p in projects
-    ]
+    ])
 
 @router.post("/", response_model=ProjectResponse)
 async def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
@@ -11,7 +11,7 @@ ENDPOINTS:
 - DELETE /api/workspaces/{workspace_id}   Delete workspace
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 import logging
@@ -25,45 +25,16 @@ from app.schemas import (
     WorkspaceUpdate,
     WorkspaceListResponse
 )
-from app.core.auth import verify_token, extract_token_from_header
+from app.api.deps import get_current_user
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# ============================================================================
-# HELPER - Get current user
-# ============================================================================
-
-def get_current_user(
-    authorization: str = Header(None),
-    db: Session = Depends(get_db)
-) -> User:
-    """Extract and verify user from Authorization header"""
-    token = extract_token_from_header(authorization)
-    
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid authorization header"
-        )
-    
-    user_id = verify_token(token)
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    
-    return user
-
+WORKSPACE_NOT_FOUND = dict(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Workspace not found"
+)
 
 # ============================================================================
 # LIST WORKSPACES
@@ -75,14 +46,13 @@ def list_workspaces(
     current_user: User = Depends(get_current_user)
 ):
     """List all workspaces for current user"""
-    logger.info(f"📋 Listing workspaces for user: {current_user.username}")
+    logger.info("Listing workspaces for user: %s", current_user.username)
     
     workspaces = db.query(Workspace).filter(
         Workspace.owner_id == current_user.id,
         Workspace.is_active == True
     ).all()
     
-    logger.info(f"✅ Found {len(workspaces)} workspaces")
     return workspaces
 
 
@@ -97,7 +67,7 @@ def create_workspace(
     current_user: User = Depends(get_current_user)
 ):
     """Create a new workspace"""
-    logger.info(f"➕ Creating workspace: {workspace_data.name}")
+    logger.info("Creating workspace: %s", workspace_data.name)
     
     new_workspace = Workspace(
         id=str(uuid.uuid4()),
@@ -111,7 +81,7 @@ def create_workspace(
     db.commit()
     db.refresh(new_workspace)
     
-    logger.info(f"✅ Workspace created: {new_workspace.id}")
+    logger.info("Workspace created: %s", new_workspace.id)
     return new_workspace
 
 
@@ -126,7 +96,7 @@ def get_workspace(
     current_user: User = Depends(get_current_user)
 ):
     """Get workspace details"""
-    logger.info(f"🔍 Getting workspace: {workspace_id}")
+    logger.info("Getting workspace: %s", workspace_id)
     
     workspace = db.query(Workspace).filter(
         Workspace.id == workspace_id,
@@ -134,13 +104,9 @@ def get_workspace(
     ).first()
     
     if not workspace:
-        logger.warning(f"❌ Workspace not found: {workspace_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Workspace not found"
-        )
+        logger.warning("Workspace not found: %s", workspace_id)
+        raise HTTPException(**WORKSPACE_NOT_FOUND)
     
-    logger.info(f"✅ Workspace found: {workspace.name}")
     return workspace
 
 
@@ -156,7 +122,7 @@ def update_workspace(
     current_user: User = Depends(get_current_user)
 ):
     """Update a workspace"""
-    logger.info(f"✏️ Updating workspace: {workspace_id}")
+    logger.info("Updating workspace: %s", workspace_id)
     
     workspace = db.query(Workspace).filter(
         Workspace.id == workspace_id,
@@ -164,11 +130,8 @@ def update_workspace(
     ).first()
     
     if not workspace:
-        logger.warning(f"❌ Workspace not found: {workspace_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Workspace not found"
-        )
+        logger.warning("Workspace not found: %s", workspace_id)
+        raise HTTPException(**WORKSPACE_NOT_FOUND)
     
     if workspace_data.name:
         workspace.name = workspace_data.name
@@ -178,7 +141,7 @@ def update_workspace(
     db.commit()
     db.refresh(workspace)
     
-    logger.info(f"✅ Workspace updated: {workspace.name}")
+    logger.info("Workspace updated: %s", workspace.name)
     return workspace
 
 
@@ -193,7 +156,7 @@ def delete_workspace(
     current_user: User = Depends(get_current_user)
 ):
     """Delete a workspace"""
-    logger.info(f"🗑️ Deleting workspace: {workspace_id}")
+    logger.info("Deleting workspace: %s", workspace_id)
     
     workspace = db.query(Workspace).filter(
         Workspace.id == workspace_id,
@@ -201,14 +164,11 @@ def delete_workspace(
     ).first()
     
     if not workspace:
-        logger.warning(f"❌ Workspace not found: {workspace_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Workspace not found"
-        )
+        logger.warning("Workspace not found: %s", workspace_id)
+        raise HTTPException(**WORKSPACE_NOT_FOUND)
     
     db.delete(workspace)
     db.commit()
     
-    logger.info(f"✅ Workspace deleted: {workspace_id}")
+    logger.info("Workspace deleted: %s", workspace_id)
     return None
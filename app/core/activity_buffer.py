@@ -0,0 +1,96 @@
+"""
+Activity Write Buffer
+Queues activity rows in-process and inserts them in batches,
+so logging an activity costs one commit per flush instead of one per event
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import insert
+
+from app.core.database import async_engine
+from app.models.models import Activity
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = 0.05
+MAX_BATCH_SIZE = 500
+
+# ============================================================================
+# ACTIVITY BUFFER
+# ============================================================================
+
+class ActivityBuffer:
+    """
+    Activity write buffer
+    - add() enqueues and returns immediately
+    - A background task flushes every FLUSH_INTERVAL_SECONDS
+    - Each flush is one multi-row INSERT + commit per MAX_BATCH_SIZE rows
+    """
+
+    def __init__(self):
+        """Initialize buffer"""
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def add(self, **values: Any) -> Dict[str, Any]:
+        """
+        Queue an activity row
+
+        Every row carries the full column set so a batch can be sent as a
+        single executemany.
+
+        Returns:
+            The row as it will be inserted (including generated id/created_at)
+        """
+        row = {column.key: values.get(column.key) for column in Activity.__table__.columns}
+        row["id"] = row["id"] or str(uuid4())
+        row["created_at"] = row["created_at"] or datetime.now()
+        self.queue.put_nowait(row)
+        return row
+
+    async def flush(self) -> None:
+        """Write everything currently queued"""
+        while not self.queue.empty():
+            batch: List[Dict[str, Any]] = []
+            while len(batch) < MAX_BATCH_SIZE and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                async with async_engine.begin() as conn:
+                    await conn.execute(insert(Activity), batch)
+            except Exception as e:
+                logger.error("Activity flush failed (%d rows): %s", len(batch), e)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flusher (call from the app lifespan)"""
+        if self._task is None:
+            # Created here so it binds to the running loop
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher once it has written any remaining rows"""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+
+activity_buffer = ActivityBuffer()
@@ -1,8 +1,236 @@
 """Authentication Utilities"""
 import os
-from typing import Optional
+import asyncio
+import base64
+import calendar
+import hashlib
+import hmac
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import bcrypt
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+# ============================================================================
+# JWT
+# ============================================================================
+# Tokens are only ever HS256, so they are signed and checked directly with
+# hmac + orjson instead of going through a general-purpose JWT library.
+
+SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+ALGORITHM = "HS256"
+
+_SIGNING_KEY = SECRET_KEY.encode()
+# The header never changes, so its encoded form is computed once
+_HEADER = {"alg": ALGORITHM, "typ": "JWT"}
+_HEADER_SEGMENT = base64.urlsafe_b64encode(orjson.dumps(_HEADER)).rstrip(b"=")
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    return hmac.new(_SIGNING_KEY, signing_input, hashlib.sha256).digest()
+
+
+def encode_token(payload: Dict[str, Any]) -> str:
+    """Sign a JWT payload"""
+    claims = dict(payload)
+    for claim in _TIME_CLAIMS:
+        if isinstance(claims.get(claim), datetime):
+            # Naive datetimes are treated as UTC, as PyJWT does
+            claims[claim] = calendar.timegm(claims[claim].utctimetuple())
+
+    signing_input = _HEADER_SEGMENT + b"." + base64.urlsafe_b64encode(orjson.dumps(claims)).rstrip(b"=")
+    signature = base64.urlsafe_b64encode(_sign(signing_input)).rstrip(b"=")
+    return (signing_input + b"." + signature).decode()
+
+
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a JWT and return its claims, or None if invalid/expired"""
+    try:
+        header_segment, payload_segment, signature_segment = token.split(".")
+        signing_input = f"{header_segment}.{payload_segment}".encode()
+        if not hmac.compare_digest(_sign(signing_input), _b64decode(signature_segment)):
+            return None
+        if orjson.loads(_b64decode(header_segment)).get("alg") != ALGORITHM:
+            return None
+
+        payload = orjson.loads(_b64decode(payload_segment))
+        now = time.time()
+        if "exp" in payload and payload["exp"] <= now:
+            return None
+        if "nbf" in payload and payload["nbf"] > now:
+            return None
+        return payload
+    except Exception:
+        return None
+
+
+# ============================================================================
+# PASSWORD HASHING
+# ============================================================================
+# bcrypt is ~80ms of CPU per call, so it runs on its own pool instead of the
+# event loop or Starlette's shared threadpool. Once BCRYPT_QUEUE_DEPTH calls
+# are waiting, further ones are turned away with a 503.
+
+BCRYPT_ROUNDS = 12
+BCRYPT_WORKERS = 2 * (os.cpu_count() or 1)
+BCRYPT_QUEUE_DEPTH = 500
+
+BCRYPT_POOL = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+
+HASHING_BUSY = dict(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many concurrent authentication requests",
+    headers={"Retry-After": "1"},
+)
+
+# Only touched from the event loop thread, so a plain counter is enough
+_bcrypt_in_flight = 0
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with bcrypt (blocking)"""
+    # bcrypt only uses the first 72 bytes
+    return bcrypt.hashpw(password.encode()[:72], bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Check a password against a bcrypt hash (blocking)"""
+    # Nothing hashes to an empty password; skip the KDF. This depends only on
+    # the submitted input, so it reveals nothing about the account
+    if not password:
+        return False
+    try:
+        return bcrypt.checkpw(password.encode()[:72], password_hash.encode())
+    except ValueError:
+        # Not a bcrypt hash
+        return False
+
+
+def is_legacy_password(password_hash: str) -> bool:
+    """True for passwords stored before bcrypt hashing, which are plaintext"""
+    return not password_hash.startswith("$2")
+
+
+def verify_legacy_password(password: str, stored: str) -> bool:
+    """Constant-time check of a password against a legacy plaintext value"""
+    if not password:
+        return False
+    return hmac.compare_digest(password.encode(), stored.encode())
+
+
+async def run_in_bcrypt_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a hashing call on BCRYPT_POOL, or raise 503 if the queue is full"""
+    global _bcrypt_in_flight
+    if _bcrypt_in_flight >= BCRYPT_WORKERS + BCRYPT_QUEUE_DEPTH:
+        raise HTTPException(**HASHING_BUSY)
+
+    _bcrypt_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(BCRYPT_POOL, func, *args)
+    finally:
+        _bcrypt_in_flight -= 1
+
+
+# ============================================================================
+# VERIFIED TOKEN CACHE
+# ============================================================================
+# Maps a hash of the bearer token to (user snapshot, expires_at). Only
+# successful verifications are stored, so a hit skips both the signature
+# check and the User SELECT.
+
+TOKEN_CACHE_TTL_SECONDS = 30
+TOKEN_CACHE_MAX_SIZE = 10_000
+# Entries expire this long before the token itself, to allow for clock skew
+TOKEN_EXPIRY_SKEW_SECONDS = 5
+
+_token_cache: Dict[bytes, Tuple[Any, float]] = {}
+# user id -> keys of that user's cached tokens, so a changed or deleted user
+# can be dropped from the cache at once
+_token_keys_by_user: Dict[Any, Set[bytes]] = {}
+
+
+# Columns left out of cached user snapshots
+SNAPSHOT_EXCLUDED_COLUMNS = frozenset({"password_hash"})
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash the token so raw credentials are never kept in memory"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _snapshot(obj: Any) -> Any:
+    """
+    Detached copy of an ORM row's loaded column values, safe to share across
+    sessions. Unloaded columns are skipped rather than lazy-loaded, and
+    password hashes are never kept in the cache.
+    """
+    unloaded = sa_inspect(obj).unloaded
+    copy = type(obj)(**{
+        c.key: getattr(obj, c.key)
+        for c in obj.__table__.columns
+        if c.key not in unloaded and c.key not in SNAPSHOT_EXCLUDED_COLUMNS
+    })
+    # Detached rather than transient, so sessions can merge(load=False) it
+    make_transient_to_detached(copy)
+    return copy
+
+
+def get_cached_user(token: str) -> Optional[Any]:
+    """Return the cached user for a previously verified token, if still fresh"""
+    key = _token_cache_key(token)
+    entry = _token_cache.get(key)
+    if entry is None:
+        return None
+
+    user, expires_at = entry
+    if time.time() >= expires_at:
+        _drop_token(key)
+        return None
+    return user
+
+
+def cache_user(token: str, user: Any, exp: Optional[float] = None) -> None:
+    """Cache a verified token's user until min(TTL, token exp)"""
+    expires_at = time.time() + TOKEN_CACHE_TTL_SECONDS
+    if exp is not None:
+        expires_at = min(expires_at, exp - TOKEN_EXPIRY_SKEW_SECONDS)
+
+    if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+        # Drop the oldest entry (dicts keep insertion order)
+        _drop_token(next(iter(_token_cache)))
+
+    key = _token_cache_key(token)
+    _token_cache[key] = (_snapshot(user), expires_at)
+    _token_keys_by_user.setdefault(user.id, set()).add(key)
+
+
+def invalidate_cached_user(user_id: Any) -> None:
+    """Forget every cached token of a user (after the row changes)"""
+    for key in list(_token_keys_by_user.pop(user_id, ())):
+        _token_cache.pop(key, None)
+
+
+def _drop_token(key: bytes) -> None:
+    entry = _token_cache.pop(key, None)
+    if entry is None:
+        return
+    keys = _token_keys_by_user.get(entry[0].id)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            _token_keys_by_user.pop(entry[0].id, None)
+
 
-# Dummy functions for authentication
 def extract_token_from_header(authorization: Optional[str]) -> Optional[str]:
     """Extract token from Authorization header"""
     if not authorization:
@@ -13,8 +241,8 @@ def extract_token_from_header(authorization: Optional[str]) -> Optional[str]:
     return None
 
 def verify_token(token: str) -> Optional[str]:
-    """Verify JWT token"""
-    # For now, accept any token
-    if token:
-        return "mock-user-id"
-    return None
+    """Verify JWT token and return its user_id"""
+    payload = decode_token(token)
+    if not payload:
+        return None
+    return payload.get("user_id")
@@ -0,0 +1,32 @@
+"""
+Auth Context Middleware
+Resolves the bearer token once per request from the verified-token cache
+and exposes the user as request.state.user
+"""
+
+from app.core.auth import extract_token_from_header, get_cached_user
+
+
+class AuthContextMiddleware:
+    """
+    Auth context middleware
+    - Pure ASGI (no BaseHTTPMiddleware task/stream overhead)
+    - Sets request.state.user to the cached user snapshot, or None
+    - Never touches the database; cache misses are resolved by get_current_user
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            user = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    token = extract_token_from_header(value.decode("latin-1"))
+                    if token:
+                        user = get_cached_user(token)
+                    break
+            scope.setdefault("state", {})["user"] = user
+        
+        await self.app(scope, receive, send)
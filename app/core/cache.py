@@ -48,12 +48,20 @@ class EDACacheManager:
                 self.redis_client.ping()
                 logger.info("✅ Redis cache connected")
             except Exception as e:
-                logger.warning(f"⚠️ Redis connection failed: {str(e)}")
+                logger.warning("Redis connection failed: %s", e)
                 self.redis_client = None
     
     async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
+        """Set cache value with TTL (see set_sync)"""
+        return self.set_sync(key, value, ttl)
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Get cache value (see get_sync)"""
+        return self.get_sync(key)
+    
+    def set_sync(self, key: str, value: Any, ttl: int = 3600) -> bool:
         """
-        Set cache value with TTL
+        Set cache value with TTL (usable from sync dependencies)
         
         Args:
             key: Cache key
@@ -71,22 +79,22 @@ class EDACacheManager:
             # Try Redis first
             if self.redis_client:
                 self.redis_client.setex(key, ttl, value)
-                logger.debug(f"✅ Redis SET: {key} (TTL: {ttl}s)")
+                logger.debug("Redis SET: %s (TTL: %ss)", key, ttl)
                 return True
             
             # Fallback to in-memory cache
             expiry = datetime.utcnow() + timedelta(seconds=ttl)
             self.in_memory_cache[key] = (value, expiry)
-            logger.debug(f"✅ Memory SET: {key} (TTL: {ttl}s)")
+            logger.debug("Memory SET: %s (TTL: %ss)", key, ttl)
             return True
             
         except Exception as e:
-            logger.error(f"❌ Cache SET failed: {key} - {str(e)}")
+            logger.error("Cache SET failed: %s - %s", key, e)
             return False
     
-    async def get(self, key: str) -> Optional[str]:
+    def get_sync(self, key: str) -> Optional[str]:
         """
-        Get cache value
+        Get cache value (usable from sync dependencies)
         
         Args:
             key: Cache key
@@ -99,47 +107,51 @@ class EDACacheManager:
             if self.redis_client:
                 value = self.redis_client.get(key)
                 if value:
-                    logger.debug(f"✅ Redis HIT: {key}")
+                    logger.debug("Redis HIT: %s", key)
                     return value
-                logger.debug(f"⏭️ Redis MISS: {key}")
+                logger.debug("Redis MISS: %s", key)
                 return None
             
             # Fallback to in-memory cache
             if key not in self.in_memory_cache:
-                logger.debug(f"⏭️ Memory MISS: {key}")
+                logger.debug("Memory MISS: %s", key)
                 return None
             
             value, expiry = self.in_memory_cache[key]
             
             # Check if expired
             if datetime.utcnow() > expiry:
-                logger.debug(f"⏰ Memory EXPIRED: {key}")
+                logger.debug("Memory EXPIRED: %s", key)
                 del self.in_memory_cache[key]
                 return None
             
-            logger.debug(f"✅ Memory HIT: {key}")
+            logger.debug("Memory HIT: %s", key)
             return value
             
         except Exception as e:
-            logger.error(f"❌ Cache GET failed: {key} - {str(e)}")
+            logger.error("Cache GET failed: %s - %s", key, e)
             return None
     
     async def delete(self, key: str) -> bool:
-        """Delete cache entry"""
+        """Delete cache entry (see delete_sync)"""
+        return self.delete_sync(key)
+    
+    def delete_sync(self, key: str) -> bool:
+        """Delete cache entry (usable from sync code and ORM events)"""
         try:
             if self.redis_client:
                 self.redis_client.delete(key)
-                logger.debug(f"🗑️ Redis DELETE: {key}")
+                logger.debug("Redis DELETE: %s", key)
                 return True
             
             if key in self.in_memory_cache:
                 del self.in_memory_cache[key]
-                logger.debug(f"🗑️ Memory DELETE: {key}")
+                logger.debug("Memory DELETE: %s", key)
                 return True
             
             return False
         except Exception as e:
-            logger.error(f"❌ Cache DELETE failed: {key} - {str(e)}")
+            logger.error("Cache DELETE failed: %s - %s", key, e)
             return False
     
     async def ping(self) -> bool:
@@ -163,7 +175,7 @@ class EDACacheManager:
             logger.info("🗑️ Memory cache cleared")
             return True
         except Exception as e:
-            logger.error(f"❌ Cache CLEAR failed: {str(e)}")
+            logger.error("Cache CLEAR failed: %s", e)
             return False
 
 # ============================================================================
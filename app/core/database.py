@@ -1,20 +1,53 @@
 """Database Configuration"""
+import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import StaticPool
 
 # Database URL
-DATABASE_URL = "sqlite:///./ml_platform.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ml_platform.db")
+
+# Async driver for each sync backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+_url = make_url(DATABASE_URL)
+if _url.get_backend_name() not in ASYNC_DRIVERS:
+    raise RuntimeError(
+        f"Unsupported DATABASE_URL backend '{_url.get_backend_name()}'; "
+        f"expected one of: {', '.join(ASYNC_DRIVERS)}"
+    )
+ASYNC_DATABASE_URL = _url.set(drivername=ASYNC_DRIVERS[_url.get_backend_name()])
+
+# Connection pool - pool_size and max_overflow are per process, so both are
+# split across uvicorn workers to keep the total under the server's
+# max_connections
+WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+POOL_OPTIONS = {
+    "pool_size": max(1, int(os.getenv("DB_POOL_SIZE", "20")) // WORKERS),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")) // WORKERS,
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "3600")),
+    "pool_pre_ping": True,
+}
+CONNECT_ARGS = {"check_same_thread": False} if _url.get_backend_name() == "sqlite" else {}
 
 # Create engine
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+    connect_args=CONNECT_ARGS,
+    **POOL_OPTIONS,
 )
 
-# Session factory
+# Async engine (same database, non-blocking driver)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **POOL_OPTIONS)
+
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -27,7 +60,16 @@ def get_db():
     finally:
         db.close()
 
+# Async dependency - for async def endpoints, keeps DB I/O off the event loop
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Initialize database
 def init_db():
     """Initialize database"""
-    pass
+    # create_all() skips tables that already exist, so indexes added to an
+    # existing model are only picked up here
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,73 @@
+"""
+DataFrame Cache
+Process-local LRU for parsed datasets, bounded by memory rather than count
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class DataFrameLRU:
+    """
+    Least-recently-used DataFrame cache with a byte budget
+    - Sized by df.memory_usage(deep=True), measured once on insert
+    - Evicts oldest entries until a new frame fits
+    - Frames larger than the whole budget are not cached
+    - Thread-safe (background parses run in the threadpool)
+    - Each frame can carry a small `info` value (e.g. a row count), not
+      counted in the budget
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (df, nbytes, info)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Cached frame (marked most recently used), or None"""
+        entry = self.get_with_info(key)
+        return entry[0] if entry is not None else None
+
+    def get_with_info(self, key: str) -> Optional[Tuple[pd.DataFrame, Any]]:
+        """Cached (frame, info) (marked most recently used), or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[2]
+
+    def put(self, key: str, df: pd.DataFrame, info: Any = None) -> None:
+        """Cache df (and info) under key, evicting least recently used frames to fit"""
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            self._discard(key)
+            if nbytes > self.max_bytes:
+                logger.info("Not caching %s: %s bytes exceeds the %s byte budget", key, nbytes, self.max_bytes)
+                return
+            while self._entries and self.bytes_used + nbytes > self.max_bytes:
+                evicted, (_, evicted_bytes, _) = self._entries.popitem(last=False)
+                self.bytes_used -= evicted_bytes
+                logger.debug("Evicted %s (%s bytes)", evicted, evicted_bytes)
+            self._entries[key] = (df, nbytes, info)
+            self.bytes_used += nbytes
+
+    def pop(self, key: str) -> None:
+        """Drop key if cached"""
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes_used -= entry[1]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -3,9 +3,14 @@ Robust JSON Serialization Utils - Handles ANY data type
 """
 import json
 import numpy as np
+import orjson
 import pandas as pd
 from datetime import datetime, date, timedelta
 from decimal import Decimal
+from starlette.responses import Response
+
+# NaN/Inf become null, numpy scalars and arrays are encoded natively
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
 
 
 class RobustJSONEncoder(json.JSONEncoder):
@@ -117,14 +122,52 @@ def serialize_for_json(obj):
     return obj
 
 
-def safe_json_dumps(obj, **kwargs):
+def _orjson_default(obj):
+    """Convert the types orjson can't encode natively (pandas, Decimal, ...)"""
+    # NaT is a datetime subclass, so it must be caught before isoformat()
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    elif isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    elif isinstance(obj, (timedelta, pd.Timedelta)):
+        return str(obj)
+    elif isinstance(obj, Decimal):
+        return float(obj)
+    elif isinstance(obj, np.ndarray):
+        # Arrays orjson can't take directly (object dtype, non-contiguous)
+        return obj.tolist()
+    elif isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def safe_json_dumps(obj):
     """
-    Safe JSON serialization with custom encoder
+    Safe JSON serialization (orjson, with pandas/numpy fallbacks)
     
     Usage:
         json_str = safe_json_dumps(data)
     """
-    return json.dumps(obj, cls=RobustJSONEncoder, **kwargs)
+    return orjson.dumps(obj, default=_orjson_default, option=ORJSON_OPTIONS).decode()
+
+
+class ORJSONResponse(Response):
+    """
+    JSON response encoded by orjson (numpy values and non-str keys included)
+    
+    Stands in for fastapi.responses.ORJSONResponse, which is deprecated.
+    """
+    media_type = "application/json"
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class SafeJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also accepts pandas/numpy values (e.g. Timestamps from a DataFrame)"""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
 
 
 def safe_json_loads(json_str):
@@ -15,6 +15,19 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def count_duplicate_rows(df: pd.DataFrame) -> int:
+    """
+    Count rows that repeat an earlier row (same result as df.duplicated().sum())
+
+    Each row is reduced to one uint64 with pandas' vectorized per-column
+    hashing and repeats are found among those, instead of factorizing every
+    column together.
+    """
+    if df.empty:
+        return 0
+    return int(pd.util.hash_pandas_object(df, index=False).duplicated().sum())
+
+
 class UniversalEDAAnalyzer:
     """
     Universal EDA Analyzer - Works for ANY dataset
@@ -23,8 +36,16 @@ class UniversalEDAAnalyzer:
     def __init__(self, df: pd.DataFrame):
         self.df = df
         self.numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        self.categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+        self.categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
         self.datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
+        self._duplicate_rows = None
+    
+    @property
+    def duplicate_rows(self) -> int:
+        """Duplicate row count, computed once per analyzer"""
+        if self._duplicate_rows is None:
+            self._duplicate_rows = count_duplicate_rows(self.df)
+        return self._duplicate_rows
         
     def get_summary(self) -> Dict[str, Any]:
         """Get data summary - Works for ANY dataset"""
@@ -48,46 +69,50 @@ class UniversalEDAAnalyzer:
             "numeric_statistics": {},
             "categorical_statistics": {},
             "missing_values": {},
-            "duplicates": int(self.df.duplicated().sum())
+            "duplicates": self.duplicate_rows
         }
         
+        # One reduction over the frame, reused by every section below
+        missing = self.df.isnull().sum()
+        
         # ✅ Handle numeric columns
         if self.numeric_cols:
             numeric_df = self.df[self.numeric_cols]
             
-            # Safe describe that handles NaN
-            desc = numeric_df.describe().replace({np.nan: None, np.inf: None, -np.inf: None})
+            # describe() already skips NaN and covers count, mean, std, min,
+            # max and the quartiles (50% is the median) for every column at once
+            raw_desc = numeric_df.describe()
+            desc = raw_desc.replace({np.nan: None, np.inf: None, -np.inf: None})
             stats["numeric_statistics"] = desc.to_dict()
             
             # Add additional stats
-            for col in self.numeric_cols:
-                col_data = numeric_df[col].dropna()  # Drop NaN for calculations
-                if len(col_data) > 0:
+            for col, col_desc in raw_desc.items():
+                if col_desc["count"] > 0:
                     stats["numeric_statistics"][col] = {
-                        "count": int(col_data.count()),
-                        "mean": float(col_data.mean()),
-                        "median": float(col_data.median()),
-                        "std": float(col_data.std()),
-                        "min": float(col_data.min()),
-                        "max": float(col_data.max()),
-                        "q25": float(col_data.quantile(0.25)),
-                        "q75": float(col_data.quantile(0.75)),
-                        "missing": int(col_data.isna().sum())
+                        "count": int(col_desc["count"]),
+                        "mean": float(col_desc["mean"]),
+                        "median": float(col_desc["50%"]),
+                        "std": float(col_desc["std"]),
+                        "min": float(col_desc["min"]),
+                        "max": float(col_desc["max"]),
+                        "q25": float(col_desc["25%"]),
+                        "q75": float(col_desc["75%"]),
+                        "missing": int(missing[col])
                     }
         
         # ✅ Handle categorical columns
         if self.categorical_cols:
             for col in self.categorical_cols:
+                # One hashed pass per column; the distinct count is its length
                 value_counts = self.df[col].value_counts()
                 stats["categorical_statistics"][col] = {
-                    "unique": int(self.df[col].nunique()),
+                    "unique": len(value_counts),
                     "top": str(value_counts.index[0]) if len(value_counts) > 0 else None,
                     "freq": int(value_counts.iloc[0]) if len(value_counts) > 0 else 0,
-                    "missing": int(self.df[col].isna().sum())
+                    "missing": int(missing[col])
                 }
         
         # ✅ Missing values summary
-        missing = self.df.isnull().sum()
         stats["missing_values"] = {
             col: {
                 "count": int(missing[col]),
@@ -102,7 +127,7 @@ class UniversalEDAAnalyzer:
         """Generate quality report - Works for ANY dataset"""
         total_cells = self.df.shape[0] * self.df.shape[1]
         missing_cells = int(self.df.isnull().sum().sum())
-        duplicate_rows = int(self.df.duplicated().sum())
+        duplicate_rows = self.duplicate_rows
         
         completeness = 100 - (missing_cells / total_cells * 100) if total_cells > 0 else 100
         uniqueness = 100 if duplicate_rows == 0 else (1 - duplicate_rows / len(self.df)) * 100
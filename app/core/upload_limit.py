@@ -0,0 +1,37 @@
+"""
+Upload Size Limit Middleware
+Rejects oversized request bodies from their Content-Length header,
+before any of the body is read
+"""
+
+from fastapi import status
+from app.core.serializer_utils import ORJSONResponse
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Upload size limit middleware
+    - Pure ASGI, runs before FastAPI parses a multipart form (which spools
+      the whole upload before the endpoint gets to check its size)
+    - Requests without Content-Length (chunked) pass through; endpoints
+      still enforce their own limit while reading
+    """
+    
+    def __init__(self, app, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_body_size:
+                        response = ORJSONResponse(
+                            {"detail": f"Request body exceeds the {self.max_body_size} byte limit"},
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        
+        await self.app(scope, receive, send)
@@ -1,5 +1,5 @@
 """Database Models"""
-from sqlalchemy import Column, String, DateTime, Text, Integer
+from sqlalchemy import Column, String, DateTime, Text, Integer, Index
 from sqlalchemy.sql import func
 from uuid import uuid4
 from app.core.database import Base
@@ -49,6 +49,10 @@ class Activity(Base):
     details = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+# Newest-first listings per project / per user walk these indexes in order
+Index("ix_activities_project_id_created_at", Activity.project_id, Activity.created_at.desc())
+Index("ix_activities_user_id_created_at", Activity.user_id, Activity.created_at.desc())
+
 class EdaResult(Base):
     """EDA Analysis Results - stores all analysis data"""
     __tablename__ = "eda_results"
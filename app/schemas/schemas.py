@@ -5,6 +5,7 @@ Required by existing auth system
 
 from pydantic import BaseModel, EmailStr
 from typing import Optional
+from datetime import datetime
 
 # ============================================================================
 # User Authentication Schemas
@@ -116,4 +117,4 @@ class ActivityResponse(BaseModel):
     entity_type: str
     entity_id: str
     details: Optional[dict] = None
-    created_at: str
+    created_at: datetime
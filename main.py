@@ -8,7 +8,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
-from app.core.database import engine, Base, init_db
+from app.core.database import engine, async_engine, Base, init_db
+from app.core.activity_buffer import activity_buffer
+from app.core.auth_middleware import AuthContextMiddleware
+from app.core.upload_limit import UploadSizeLimitMiddleware
+from app.core.serializer_utils import ORJSONResponse
 from app.api import auth, projects, datasets, datasources, models, activities, eda
 # IMPORTANT: Import ALL models so they register with Base for table creation
 from app.models.models import User, Project, Dataset, Activity, Datasource, Model
@@ -40,6 +44,9 @@ async def lifespan(app: FastAPI):
     init_db()
     logger.info("✅ Default data initialized")
     
+    # Batched activity writes
+    activity_buffer.start()
+    
     logger.info("=" * 70)
     logger.info("✅ ML PLATFORM READY!")
     logger.info("=" * 70)
@@ -51,6 +58,8 @@ async def lifespan(app: FastAPI):
     
     # SHUTDOWN
     logger.info("🛑 Shutting down ML Platform...")
+    await activity_buffer.stop()
+    await async_engine.dispose()
     logger.info("✅ Cleanup complete")
 
 # ============================================================================
@@ -61,27 +70,41 @@ app = FastAPI(
     title="ML Platform with EDA",
     description="Complete ML Platform with Exploratory Data Analysis",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson for every route; also writes NaN from pandas results as null
+    # where the stdlib encoder would raise
+    default_response_class=ORJSONResponse,
 )
 
 # ============================================================================
 # MIDDLEWARE
 # ============================================================================
 
+# Oversized uploads get a 413 from Content-Length, before the body is read.
+# Added before CORS so the rejection still carries CORS headers
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=datasets.MAX_UPLOAD_SIZE_BYTES + datasets.MULTIPART_OVERHEAD_BYTES,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Total-Rows"],
 )
 
+# Resolves cached bearer tokens once per request into request.state.user
+app.add_middleware(AuthContextMiddleware)
+
 # ============================================================================
 # ROUTE REGISTRATION
 # ============================================================================
 
 # Auth routes
-app.include_router(auth.router, tags=["Authentication"])
+app.include_router(auth.router)
 
 # Core routes
 app.include_router(projects.router)
@@ -123,21 +146,21 @@ async def health_check():
 # ============================================================================
 
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None),
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Handle general exceptions"""
     logger.error(f"❌ Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"},
     )
@@ -147,6 +170,16 @@ async def general_exception_handler(request, exc):
 # ============================================================================
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     logger.info("🎯 ML Platform starting on http://localhost:8000")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # "auto" selects uvloop / httptools when installed (uvicorn[standard]),
+    # falling back to asyncio / h11 where they are unavailable (e.g. Windows)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",
+        http="auto",
+    )
@@ -0,0 +1,16 @@
+"""
+Test configuration
+Runs the app from a scratch directory against a throwaway SQLite database,
+so uploads and the database file never land in the working tree
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_workdir = tempfile.mkdtemp(prefix="ml-platform-tests-")
+os.chdir(_workdir)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/test.db")
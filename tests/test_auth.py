@@ -0,0 +1,277 @@
+"""
+Authentication Tests
+Login, bearer-token resolution and the user caches behind it
+
+Run with: pytest tests/test_auth.py
+"""
+
+import asyncio
+import base64
+import time
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api import auth as auth_routes
+from app.api.deps import get_current_user
+from app.core import auth
+from app.core.auth_middleware import AuthContextMiddleware
+from app.core.database import Base, SessionLocal, engine
+from app.models.models import User
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AuthContextMiddleware)
+    app.include_router(auth_routes.router)
+
+    @app.get("/me")
+    def me(user: User = Depends(get_current_user)):
+        return {"id": user.id, "username": user.username}
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def client():
+    Base.metadata.create_all(bind=engine)
+    with TestClient(_build_app()) as c:
+        yield c
+
+
+def _login(client, username: str, password: str = "secret-password") -> dict:
+    response = client.post("/api/auth/login", json={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+# ============================================================================
+# TOKENS
+# ============================================================================
+
+def _segment(data: dict) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(data)).rstrip(b"=").decode()
+
+
+def _signed(header: dict, payload: dict) -> str:
+    """Token with an arbitrary header, validly signed with the app's key"""
+    signing_input = f"{_segment(header)}.{_segment(payload)}".encode()
+    signature = base64.urlsafe_b64encode(auth._sign(signing_input)).rstrip(b"=").decode()
+    return f"{signing_input.decode()}.{signature}"
+
+
+def test_token_round_trip():
+    payload = {"user_id": "user-1", "exp": int(time.time()) + 60}
+    assert auth.decode_token(auth.encode_token(payload)) == payload
+
+
+def test_token_datetime_claims_become_epoch_seconds():
+    exp = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(minutes=5)
+    claims = auth.decode_token(auth.encode_token({"user_id": "user-1", "exp": exp}))
+    assert claims["exp"] == int(exp.timestamp())
+
+
+def test_token_tampered_signature_rejected():
+    token = auth.encode_token({"user_id": "user-1", "exp": int(time.time()) + 60})
+    header, payload, signature = token.split(".")
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+    assert auth.decode_token(f"{header}.{payload}.{flipped}") is None
+
+
+def test_token_tampered_payload_rejected():
+    token = auth.encode_token({"user_id": "user-1", "exp": int(time.time()) + 60})
+    header, _, signature = token.split(".")
+    forged = _segment({"user_id": "admin", "exp": int(time.time()) + 60})
+    assert auth.decode_token(f"{header}.{forged}.{signature}") is None
+
+
+@pytest.mark.parametrize("alg", ["HS512", "none", "RS256"])
+def test_token_wrong_alg_rejected(alg):
+    payload = {"user_id": "user-1", "exp": int(time.time()) + 60}
+    assert auth.decode_token(_signed({"alg": alg, "typ": "JWT"}, payload)) is None
+
+
+def test_token_unsigned_alg_none_rejected():
+    payload = _segment({"user_id": "user-1", "exp": int(time.time()) + 60})
+    assert auth.decode_token(f"{_segment({'alg': 'none', 'typ': 'JWT'})}.{payload}.") is None
+
+
+def test_token_expired_rejected():
+    assert auth.decode_token(auth.encode_token({"user_id": "user-1", "exp": int(time.time()) - 1})) is None
+
+
+def test_token_not_yet_valid_rejected():
+    payload = {"user_id": "user-1", "exp": int(time.time()) + 60, "nbf": int(time.time()) + 30}
+    assert auth.decode_token(auth.encode_token(payload)) is None
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "not-a-token",
+    "a.b",
+    "a.b.c.d",
+    "!!!.###.$$$",
+    f"{_segment({'alg': 'HS256'})}.not-json.c2ln",
+])
+def test_token_malformed_rejected(token):
+    assert auth.decode_token(token) is None
+
+
+def test_token_signed_non_json_payload_rejected():
+    signing_input = f"{_segment({'alg': 'HS256', 'typ': 'JWT'})}.bm90LWpzb24".encode()
+    signature = base64.urlsafe_b64encode(auth._sign(signing_input)).rstrip(b"=").decode()
+    assert auth.decode_token(f"{signing_input.decode()}.{signature}") is None
+
+
+def test_hashing_busy_raises_a_new_exception_each_time(monkeypatch):
+    """A shared exception instance would pile up every raise's traceback"""
+    monkeypatch.setattr(auth, "_bcrypt_in_flight", auth.BCRYPT_WORKERS + auth.BCRYPT_QUEUE_DEPTH)
+    errors = []
+    for _ in range(2):
+        with pytest.raises(HTTPException) as raised:
+            asyncio.run(auth.run_in_bcrypt_pool(auth.hash_password, "pw"))
+        errors.append(raised.value)
+    assert errors[0] is not errors[1]
+    assert errors[0].status_code == 503
+    assert errors[0].headers == {"Retry-After": "1"}
+
+
+# ============================================================================
+# LOGIN
+# ============================================================================
+
+def test_login_checks_existing_users_password(client):
+    first = _login(client, "password-user", "right-password")
+    second = _login(client, "password-user", "right-password")
+    assert second["user"]["id"] == first["user"]["id"]
+
+    for _ in range(2):
+        response = client.post("/api/auth/login", json={"username": "password-user", "password": "wrong-password"})
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid username or password"
+
+
+def test_login_by_email_checks_password(client):
+    body = _login(client, "email-user", "right-password")
+    email = body["user"]["email"]
+    assert _login(client, email, "right-password")["user"]["id"] == body["user"]["id"]
+
+    response = client.post("/api/auth/login", json={"username": email, "password": "wrong-password"})
+    assert response.status_code == 401
+
+
+def test_login_rejects_empty_password(client):
+    response = client.post("/api/auth/login", json={"username": "empty-password-user", "password": ""})
+    assert response.status_code == 401
+
+
+def test_login_upgrades_legacy_plaintext_password(client):
+    """Accounts stored before password hashing keep working and are rehashed"""
+    with SessionLocal() as db:
+        db.add(User(id="legacy-user", username="legacy-user", email="legacy@example.com", password_hash="pw"))
+        db.commit()
+
+    response = client.post("/api/auth/login", json={"username": "legacy-user", "password": "wrong"})
+    assert response.status_code == 401
+
+    assert _login(client, "legacy-user", "pw")["user"]["id"] == "legacy-user"
+    with SessionLocal() as db:
+        stored = db.get(User, "legacy-user").password_hash
+    assert stored.startswith("$2") and auth.verify_password("pw", stored)
+
+    # Checked against the new bcrypt hash from now on
+    assert _login(client, "legacy-user", "pw")["user"]["id"] == "legacy-user"
+    response = client.post("/api/auth/login", json={"username": "legacy-user", "password": "wrong"})
+    assert response.status_code == 401
+
+
+def test_register_rejects_taken_username_and_email(client):
+    body = {"username": "taken-user", "email": "taken@example.com", "password": "secret-password"}
+    assert client.post("/api/auth/register", json=body).status_code == 200
+
+    for _ in range(2):
+        response = client.post("/api/auth/register", json=body)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Username already registered"
+
+    response = client.post("/api/auth/register", json={**body, "username": "other-user"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+
+
+# ============================================================================
+# CACHED USERS
+# ============================================================================
+
+def test_user_cache_hit_on_second_request(client):
+    """Second request resolves the user from the shared user cache, without SQL"""
+    body = _login(client, "cache-user")
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    for _ in range(2):
+        # Force the token-cache miss path, so load_user runs every time
+        auth._token_cache.clear()
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.get("/me", headers=_bearer(body["access_token"]))
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert response.status_code == 200, response.text
+        assert response.json() == {"id": body["user"]["id"], "username": "cache-user"}
+    assert statements == []
+
+
+def test_token_cache_hit_after_login(client):
+    """Login seeds the verified-token cache; later requests are served from it"""
+    body = _login(client, "token-user")
+    for _ in range(3):
+        response = client.get("/me", headers=_bearer(body["access_token"]))
+        assert response.status_code == 200, response.text
+        assert response.json() == {"id": body["user"]["id"], "username": "token-user"}
+
+
+def test_token_cache_hit_after_cold_request(client):
+    """A user resolved from the database is cached and served on the next request"""
+    body = _login(client, "cold-user")
+    auth._token_cache.clear()
+    for _ in range(2):
+        response = client.get("/me", headers=_bearer(body["access_token"]))
+        assert response.status_code == 200, response.text
+
+
+def test_updated_user_is_not_served_from_cache(client):
+    """Updating a user drops their cached tokens as well as the user cache"""
+    body = _login(client, "rename-user")
+    headers = _bearer(body["access_token"])
+    assert client.get("/me", headers=headers).json()["username"] == "rename-user"
+
+    with SessionLocal() as db:
+        db.get(User, body["user"]["id"]).username = "renamed-user"
+        db.commit()
+
+    assert client.get("/me", headers=headers).json()["username"] == "renamed-user"
+
+
+def test_deleted_user_is_rejected(client):
+    """Deleting a user drops their cached tokens, so the next request is a 401"""
+    body = _login(client, "deleted-user")
+    headers = _bearer(body["access_token"])
+    assert client.get("/me", headers=headers).status_code == 200
+
+    with SessionLocal() as db:
+        db.delete(db.get(User, body["user"]["id"]))
+        db.commit()
+
+    assert client.get("/me", headers=headers).status_code == 401
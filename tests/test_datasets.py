@@ -0,0 +1,330 @@
+"""
+Dataset API Tests
+Cache ingest, previews and quality reports
+
+Run with: pytest tests/test_datasets.py
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+from uuid import uuid4
+
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import datasets
+from app.api.phase3_correlations_endpoints import router as phase3_router
+from app.core.database import Base, SessionLocal, engine
+from app.models.models import Dataset
+from app.core.phase2_statistics_extended import Phase2StatisticsExtended
+
+
+# ============================================================================
+# CACHE INGEST
+# ============================================================================
+
+def test_compact_frame_keeps_integer_width():
+    """Integer columns stay int64, so range/sum arithmetic can't overflow"""
+    df = datasets._compact_frame(pd.DataFrame({"x": np.arange(-100, 101)}))
+    assert df["x"].dtype == np.int64
+
+    distribution = Phase2StatisticsExtended(df).get_distribution_analysis()
+    assert "Range: 200.00" in distribution["distributions"]["x"]["characteristics"]
+
+
+def test_compact_frame_categorizes_parsed_text():
+    """Text columns read by read_csv (object, or str on pandas 3) become category"""
+    csv = "city,name\n" + "".join(f"{c},n{i}\n" for i, c in enumerate(["a", "b", "a", "b"] * 5))
+    df = datasets._compact_frame(pd.read_csv(io.StringIO(csv)))
+    assert isinstance(df["city"].dtype, pd.CategoricalDtype)
+    # Every value distinct: left as text
+    assert not isinstance(df["name"].dtype, pd.CategoricalDtype)
+
+
+# ============================================================================
+# PREVIEW
+# ============================================================================
+
+FLOATS = [2 / 3, 0.1234567890123456789, 1e-20, 123456789.123456789]
+
+
+@pytest.fixture(scope="module")
+def client():
+    Base.metadata.create_all(bind=engine)
+    app = FastAPI()
+    app.include_router(datasets.router)
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def dataset_id():
+    """A dataset whose uploaded CSV has full-precision floats and datetimes"""
+    dataset_id = str(uuid4())
+    frame = pd.DataFrame({
+        "x": FLOATS,
+        "when": ["2024-01-02 03:04:05", "2024-01-02 00:00:00", "", "2024-12-31 23:59:59"],
+        "label": ["a", "b", None, "d"],
+    })
+    frame.to_csv(datasets._csv_path(dataset_id), index=False, float_format="%.17g")
+    with SessionLocal() as db:
+        db.add(Dataset(id=dataset_id, name="floats", file_name=f"{dataset_id}.csv"))
+        db.commit()
+    return dataset_id
+
+
+def test_preview_rows_keep_full_float_precision(client, dataset_id):
+    body = client.get(f"/api/datasets/{dataset_id}/preview").json()
+    assert [row["x"] for row in body["rows"]] == FLOATS
+    # isoformat(), with no fractional seconds added
+    assert body["rows"][0]["when"] == "2024-01-02T03:04:05"
+    assert body["rows"][2]["when"] is None
+
+
+def test_preview_columns_keep_full_float_precision(client, dataset_id):
+    body = client.get(f"/api/datasets/{dataset_id}/preview", params={"layout": "columns"}).json()
+    assert body["data"]["x"] == FLOATS
+
+
+def test_preview_ndjson_matches_json_rows(client, dataset_id):
+    url = f"/api/datasets/{dataset_id}/preview"
+    response = client.get(url, headers={"Accept": datasets.NDJSON_MEDIA_TYPE})
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+    assert lines == client.get(url).json()["rows"]
+    assert [line["x"] for line in lines] == FLOATS
+
+
+# ============================================================================
+# QUALITY
+# ============================================================================
+
+def test_footer_quality_dtypes_match_frame(tmp_path, monkeypatch):
+    frame = pd.DataFrame({
+        "city": pd.Categorical(["a", "b", "a"]),
+        "n": [1, 2, 3],
+        "x": [0.5, None, 1.5],
+    })
+    monkeypatch.setattr(datasets, "_snapshot_path", lambda dataset_id: str(tmp_path / f"{dataset_id}.parquet"))
+    frame.to_parquet(datasets._snapshot_path("footer"))
+
+    stats = datasets._footer_quality_stats("footer")
+    assert stats["columns"] == datasets._frame_quality_stats(frame)["columns"]
+    assert stats["null_counts"] == [0, 0, 1]
+
+
+def test_quality_same_before_and_after_snapshot(client):
+    """The pandas path (no snapshot yet) and the snapshot scan agree"""
+    dataset_id = str(uuid4())
+    with open(datasets._csv_path(dataset_id), "w") as f:
+        f.write("x,label\n1.5,a\nNA,n/a\n2.5,b\nn/a,a\n1.5,a\n")
+    with SessionLocal() as db:
+        db.add(Dataset(id=dataset_id, name="markers", file_name=f"{dataset_id}.csv"))
+        db.commit()
+
+    url = f"/api/datasets/{dataset_id}/quality"
+    before = client.get(url).json()
+    assert [c["missing_count"] for c in before["column_quality"]] == [2, 1]
+
+    datasets._analyze_dataset(dataset_id, datasets._csv_path(dataset_id))
+    datasets.dataset_cache.pop(dataset_id)
+    after = client.get(url).json()
+    assert after == before
+
+
+def _register_csv(content: bytes) -> str:
+    dataset_id = str(uuid4())
+    with open(datasets._csv_path(dataset_id), "wb") as f:
+        f.write(content)
+    with SessionLocal() as db:
+        db.add(Dataset(id=dataset_id, name="raw", file_name=f"{dataset_id}.csv"))
+        db.commit()
+    return dataset_id
+
+
+def test_category_columns_report_their_values_dtype(client):
+    """Compacting a text column to category doesn't change its reported type"""
+    dataset_id = _register_csv(b"city,n\n" + b"a,1\nb,2\n" * 10)
+    text_type = str(pd.read_csv(io.BytesIO(b"city\na\n"))["city"].dtype)
+    preview_url = f"/api/datasets/{dataset_id}/preview"
+    quality_url = f"/api/datasets/{dataset_id}/quality"
+
+    def types():
+        preview = client.get(preview_url).json()
+        quality = client.get(quality_url).json()
+        return (
+            {c["name"]: c["type"] for c in preview["columns"]},
+            {c["name"]: c["data_type"] for c in quality["column_quality"]},
+        )
+
+    # Raw CSV, then the cached compact frame, then the snapshot
+    cold = types()
+    assert cold[0] == {"city": text_type, "n": "int64"}
+    assert isinstance(datasets.dataset_cache.get(dataset_id)["city"].dtype, pd.CategoricalDtype)
+    assert types() == cold
+
+    datasets._analyze_dataset(dataset_id, datasets._csv_path(dataset_id))
+    datasets.dataset_cache.pop(dataset_id)
+    assert types() == cold
+
+
+def test_quality_unreadable_file_is_no_data(client):
+    dataset_id = _register_csv(b'a,b\n1,2\n"unterminated\xff\xfe,3\n4,5,6,7\n')
+    assert client.get(f"/api/datasets/{dataset_id}/quality").json() == datasets.NO_DATA_ERROR
+
+
+def test_quality_unexpected_error_is_not_hidden(client, monkeypatch, caplog):
+    dataset_id = _register_csv(b"a,b\n1,2\n")
+
+    def broken(df):
+        raise RuntimeError("bug")
+    monkeypatch.setattr(datasets, "_frame_quality_stats", broken)
+
+    response = client.get(f"/api/datasets/{dataset_id}/quality")
+    assert response.status_code == 500
+    assert "Quality analysis failed" in caplog.text
+
+    errors = []
+    db = SessionLocal()
+    try:
+        for _ in range(2):
+            with pytest.raises(HTTPException) as raised:
+                datasets.get_dataset_quality(dataset_id, detailed=True, db=db)
+            errors.append(raised.value)
+    finally:
+        db.close()
+    assert errors[0] is not errors[1]
+
+
+def test_csv_preview_with_late_type_change(client):
+    """Ints for more than the first parsed block, then text in the same column"""
+    pad = "x" * 120
+    lines = ["n,pad"] + [f"{i},{pad}" for i in range(9999)] + [f"text,{pad}"]
+    dataset_id = _register_csv(("\n".join(lines) + "\n").encode())
+
+    response = client.get(f"/api/datasets/{dataset_id}/preview", params={"rows": 10000, "layout": "columns"})
+    assert response.status_code == 200
+    values = response.json()["data"]["n"]
+    assert len(values) == 10000
+    assert values[-1] == "text"
+
+
+def test_preview_rows_are_bounded(client, dataset_id):
+    url = f"/api/datasets/{dataset_id}/preview"
+    assert client.get(url, params={"rows": datasets.MAX_PREVIEW_ROWS + 1}).status_code == 422
+    assert client.get(url, params={"rows": 0}).status_code == 422
+
+
+def test_preview_layout_is_validated(client, dataset_id):
+    url = f"/api/datasets/{dataset_id}/preview"
+    assert client.get(url, params={"layout": "colums"}).status_code == 422
+
+
+def test_cached_previews_count_against_the_cache_budget(client, dataset_id):
+    used = datasets.dataset_cache.bytes_used
+    body = client.get(f"/api/datasets/{dataset_id}/preview", params={"rows": 3}).json()
+    assert body["preview_rows"] == 3
+    assert datasets.dataset_cache.bytes_used > used
+
+
+# ============================================================================
+# UPLOAD
+# ============================================================================
+
+def test_upload_without_hard_links_copies_off_the_event_loop(client, monkeypatch):
+    """Filesystems without hard links fall back to a copy, run in the threadpool"""
+    on_event_loop = []
+    real_copyfile = shutil.copyfile
+
+    def no_link(src, dst):
+        raise OSError("hard links not supported")
+
+    def copyfile(src, dst):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        return real_copyfile(src, dst)
+
+    monkeypatch.setattr(datasets.os, "link", no_link)
+    monkeypatch.setattr(datasets.shutil, "copyfile", copyfile)
+
+    response = client.post(
+        "/api/datasets/",
+        data={"name": "copied", "project_id": "p1"},
+        files={"file": ("copied.csv", b"a,b\n1,2\n", "text/csv")},
+    )
+    assert response.status_code == 202, response.text
+    with open(datasets._csv_path(response.json()["id"]), "rb") as f:
+        assert f.read() == b"a,b\n1,2\n"
+    assert on_event_loop == [False]
+
+
+# ============================================================================
+# PHASE 3
+# ============================================================================
+
+def test_upload_spooled_to_disk_is_read_once(client, monkeypatch):
+    """Large uploads are hashed while they're copied, not re-read afterwards"""
+    content = b"a,b\n" + b"1,2\n" * (1024 * 1024)
+    opened = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(str(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(datasets, "open", counting_open, raising=False)
+    response = client.post(
+        "/api/datasets/",
+        data={"name": "large", "project_id": "p1"},
+        files={"file": ("large.csv", content, "text/csv")},
+    )
+    assert response.status_code == 202, response.text
+    assert len(opened) == 1 and opened[0].endswith(".part")
+
+    digest = hashlib.sha256(content).hexdigest()
+    with open(f"{datasets.OBJECT_DIR}/{digest}.csv", "rb") as f:
+        assert f.read() == content
+
+
+def test_phase3_reads_uploaded_datasets_through_the_frame_loader(client):
+    dataset_id = _register_csv(b"a,b,c\n1,2,3\n2,4,1\n3,6,2\n4,8,5\n")
+    app = FastAPI()
+    app.include_router(phase3_router)
+    with TestClient(app) as phase3:
+        response = phase3.get(f"/api/eda/{dataset_id}/phase3/correlations/enhanced")
+    assert response.status_code == 200, response.text
+    assert response.json()["total_features"] == 3
+    # Loaded once, then shared with the other dataset endpoints
+    assert datasets.dataset_cache.get(dataset_id) is not None
+
+
+def test_oversized_upload_is_rejected_and_cleaned_up(client, monkeypatch):
+    monkeypatch.setattr(datasets, "MAX_UPLOAD_SIZE_BYTES", 8)
+    before = set(os.listdir(datasets.UPLOAD_DIR))
+    for _ in range(2):
+        response = client.post(
+            "/api/datasets/",
+            data={"name": "big", "project_id": "p1"},
+            files={"file": ("big.csv", b"a,b\n" + b"1,2\n" * 10, "text/csv")},
+        )
+        assert response.status_code == 413
+    assert set(os.listdir(datasets.UPLOAD_DIR)) == before
+
+
+def test_upload_with_unsupported_extension_is_rejected(client):
+    for _ in range(2):
+        response = client.post(
+            "/api/datasets/",
+            data={"name": "binary", "project_id": "p1"},
+            files={"file": ("data.exe", b"MZ", "application/octet-stream")},
+        )
+        assert response.status_code == 400